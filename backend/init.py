@@ -20,26 +20,42 @@
 # SPDX-License-Identifier: Apache-2.0
 ###############################################################
 import argparse
+import asyncio
+import itertools
 import logging.config
+import time
 import yaml
 import urllib3
 import uvicorn
 import uuid
-from fastapi import FastAPI, Depends, Request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Callable, List, Optional
+from fastapi import FastAPI, Depends, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from auth.keycloak_config import keycloak_openid
 
 from models.connector import Connector
-from models.database import ConnectorDB
+from models.database import ConnectorDB, ReleaseHistoryDB
+from models.requests import CatalogRequest
 from tractusx_sdk.dataspace.managers import AuthManager
 from tractusx_sdk.dataspace.managers import OAuth2Manager
+from managers.activityManager import ActivityManager
+from managers.asyncDatabaseManager import AsyncDatabaseManager
+from managers.catalogManager import CatalogManager
 from managers.edcManager import EdcManager
 from managers.databaseManager import DatabaseManager
+from managers.healthManager import HealthManager
+from managers.inventoryManager import InventoryManager
+from managers.jobManager import JobManager
 from service.edcService import EdcService
+from utilities.httpClient import HttpClient
 from utilities.httpUtils import HttpUtils
+from utilities.metrics import METRICS_CONTENT_TYPE, http_request_duration, http_requests_in_flight, render_metrics
 from utilities.operators import op
 from utilities.auth_utils import get_oauth2_token
+from utilities.common import diff_values, mask_diff, values_hash
 
 op.make_dir("logs")
 
@@ -48,6 +64,19 @@ authManager: AuthManager
 edcManager: EdcManager
 edcService: EdcService
 databaseManager: DatabaseManager
+activityManager: ActivityManager
+asyncDatabaseManager: AsyncDatabaseManager
+healthManager: HealthManager
+inventoryManager: InventoryManager
+catalogManager: CatalogManager
+jobManager: JobManager
+httpClient: HttpClient
+
+## Default time window of the activity summary per granularity
+SUMMARY_WINDOWS = {"hour": timedelta(hours=24), "day": timedelta(days=30)}
+## Seconds without activity after which the live tail sends a keep-alive
+STREAM_HEARTBEAT = 15
+REPLAY_CHUNK = 500
 
 urllib3.disable_warnings()
 logging.captureWarnings(True)
@@ -85,8 +114,43 @@ with open("config/settings.yaml", "r") as f:
 # ------------------------------------------------------------
 app = FastAPI(title="EMC Backend")
 keycloak_openid.add_swagger_config(app)
+
 logger.info("[INIT] Starting EMC Backend...")
 
+async def observe_stream(body: AsyncIterator[bytes], on_close: Callable[[], None]) -> AsyncIterator[bytes]:
+    try:
+        async for chunk in body:
+            yield chunk
+    finally:
+        on_close()
+
+@app.middleware("http")
+async def observe_request_latency(request: Request, call_next):
+    """
+    Records the latency per route template, not the concrete path, to keep the number of series bounded.
+    The observation is made once the response body was sent, so streamed responses (the asset, policy
+    and contract listings and the activity tail) count until the stream ends and stay in flight meanwhile
+    """
+    http_requests_in_flight.inc()
+    started = time.monotonic()
+
+    def observe(status: int):
+        route = request.scope.get("route")
+        http_request_duration.labels(
+            method=request.method,
+            route=route.path if route is not None else "unmatched",
+            status=status
+        ).observe(time.monotonic() - started)
+        http_requests_in_flight.dec()
+
+    try:
+        response = await call_next(request)
+    except Exception:
+        observe(500)
+        raise
+    response.body_iterator = observe_stream(response.body_iterator, lambda: observe(response.status_code))
+    return response
+
 # ------------------------------------------------------------
 # Initialize Managers
 # ------------------------------------------------------------
@@ -97,6 +161,323 @@ logger.info("[INIT] Starting EMC Backend...")
 
 logger.info("[INIT] All managers initialized successfully!")
 
+# ------------------------------------------------------------
+# Background Tasks
+# ------------------------------------------------------------
+
+@app.on_event("startup")
+async def start_background_tasks():
+    startup_config: dict = app_configuration.get("startup", {})
+    if startup_config.get("checks", False):
+        healthManager.start_polling(refresh_interval=startup_config.get("refresh_interval", 10))
+
+async def refresh_release_index_periodically(refresh_interval: float):
+    namespace = app_configuration.get("clusterConfig",{}).get("namespace", None)
+    while True:
+        try:
+            await asyncio.to_thread(edcService.refresh_release_index, namespace)
+        except Exception as e:
+            logger.error(f"[INIT] Helm release index refresh failed: {str(e)}")
+        await asyncio.sleep(refresh_interval)
+
+@app.on_event("startup")
+async def start_release_indexer():
+    app.state.release_indexer = asyncio.create_task(
+        refresh_release_index_periodically(edcService.release_index_ttl / 2)
+    )
+
+@app.on_event("startup")
+async def prepare_charts():
+    ## Packaged in the background, a deploy arriving earlier packages its chart on first use
+    app.state.chart_preparation = asyncio.create_task(
+        asyncio.to_thread(edcService.prepare_charts, edcManager.get_chart_files())
+    )
+
+async def apply_activity_retention_periodically(retention_config: dict):
+    while True:
+        try:
+            await asyncio.to_thread(
+                activityManager.apply_retention,
+                retention_days=retention_config.get("days"),
+                archive_directory=retention_config.get("archive_directory", "./data/activity-archive"),
+                hourly_rollup_days=retention_config.get("hourly_rollup_days")
+            )
+        except Exception as e:
+            logger.error(f"[INIT] Activity retention failed: {str(e)}")
+        await asyncio.sleep(retention_config.get("interval", 3600))
+
+@app.on_event("startup")
+async def start_activity_retention():
+    retention_config: dict = app_configuration.get("activity", {}).get("retention", {})
+    app.state.activity_retention = None
+    if retention_config.get("days"):
+        app.state.activity_retention = asyncio.create_task(apply_activity_retention_periodically(retention_config))
+
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    app.state.release_indexer.cancel()
+    if app.state.activity_retention is not None:
+        app.state.activity_retention.cancel()
+    await healthManager.stop_polling()
+    healthManager.shutdown()
+    inventoryManager.shutdown()
+    jobManager.shutdown()
+    httpClient.close()
+    await asyncio.to_thread(activityManager.shutdown)
+    await asyncDatabaseManager.close()
+
+# ------------------------------------------------------------
+# Deployment Jobs
+# ------------------------------------------------------------
+
+def get_helm_error(response: dict) -> str:
+    data = str(response.get("data", ""))
+    return data.split('Error', 1)[1] if 'Error' in data else data
+
+def build_connector_db(connector: Connector, namespace: str) -> ConnectorDB:
+    # dtr_db = DigitalTwinRegistryDB(
+    #     url=connector.registry.url,
+    #     credentials=connector.registry.credentials
+    # )
+
+    # submodel_db = SubModelServerDB(
+    #     url=connector.submodel.url,
+    #     credentials=connector.submodel.credentials
+    # )
+    connector_db = ConnectorDB(
+        id=str(uuid.uuid4()),
+        name=connector.name,
+        bpn=connector.bpn,
+        url = connector.url,
+        version = connector.version,
+        namespace = namespace,
+        status = "unhealthy",
+        cp_hostname = connector.name + '-' + app_configuration.get("edc", {}).get("hostname", {}).get("cp"),
+        dp_hostname = connector.name + '-' + app_configuration.get("edc", {}).get("hostname", {}).get("dp"),
+        db_name = 'edc',
+        db_username = connector.db_username,
+        db_password = connector.db_password,
+        registry=connector.registry.url,
+        submodel=connector.submodel.url
+    )
+    connector_db.config = edcManager.build_connector_urls(
+        connector_db.cp_hostname, connector_db.registry, connector_db.submodel
+    )
+    return connector_db
+
+def build_release_history(connector: Connector, action: str, response: dict) -> ReleaseHistoryDB:
+    succeeded = response.get("status_code", 0) == 200
+    release: dict = response.get("data") if succeeded else {}
+    return ReleaseHistoryDB(
+        connector_name=connector.name,
+        action=action,
+        revision=release.get("revision"),
+        chart_version=release.get("chart_version") or connector.version,
+        app_version=release.get("app_version"),
+        status=release.get("status"),
+        outcome="succeeded" if succeeded else "failed",
+        duration=response.get("duration"),
+        error=None if succeeded else get_helm_error(response)
+    )
+
+def deploy_connector(connector: Connector, progress) -> dict:
+    """
+    Installs the connector chart when the release does not exist yet and registers the connector in the database.
+    Runs on a job worker thread.
+    """
+    namespace = app_configuration.get("clusterConfig",{}).get("namespace", None)
+    is_registry_enabled = len(connector.registry.url) != 0
+    is_submodel_enabled = len(connector.submodel.url) != 0
+    output = None
+
+    progress("checking")
+    existingDeployments = edcService.get_connector_by_name(
+        connector_name=connector.name,
+        namespace=namespace
+    )
+    if existingDeployments.get("status_code") != 200:
+        progress("rendering")
+        values = edcManager.render_edc(
+            connector,
+            is_registry_enabled=is_registry_enabled,
+            is_submodel_enabled=is_submodel_enabled
+        )
+        value_file_name = edcManager.write_edc_values(connector, values)
+
+        progress("installing")
+        response: dict = edcService.install_helm_chart(deployment_name=connector.name,
+                                                       values_files=[value_file_name],
+                                                       namespace=namespace,
+                                                       chart=edcService.get_chart(edcManager.get_chart_file(connector.version))
+                                                    )
+        databaseManager.add_release_history([build_release_history(connector, "install", response)])
+        if (response.get("status_code", 0) != 200):
+            raise Exception(get_helm_error(response))
+        output = response.get("data")
+        databaseManager.save_applied_values([(connector.name, connector.version, values)])
+
+    progress("registering")
+    connector_db = databaseManager.get_connector_by_name(connector.name)
+    if connector_db is None:
+        logger.info(f"Entry not found in database, creating entry for {connector.name}")
+
+        connector_db = build_connector_db(connector, namespace)
+        connector_db = databaseManager.create_connector(connector=connector_db)
+
+    return {"output": output, "connector": connector_db.to_dict()}
+
+def plan_upgrade(connector: Connector) -> dict:
+    """
+    Renders the values of the connector and diffs them against the values applied last.
+    The upgrade can be skipped when the release exists and neither the values nor the chart version changed.
+    """
+    namespace = app_configuration.get("clusterConfig",{}).get("namespace", None)
+    values = edcManager.render_edc(connector)
+    applied = databaseManager.get_applied_values(connector.name)
+    if applied is None:
+        return {"values": values, "changed": True, "reason": "no applied values recorded", "diff": None}
+    if connector.name not in edcService.get_releases(namespace):
+        return {"values": values, "changed": True, "reason": "release does not exist", "diff": None}
+
+    diff = [] if applied.values_hash == values_hash(values) else diff_values(applied.values, values)
+    if applied.chart_version != connector.version:
+        diff.insert(0, {"path": "chart.version", "change": "changed", "old": applied.chart_version, "new": connector.version})
+    return {"values": values, "changed": len(diff) != 0, "reason": None, "diff": diff}
+
+def redeploy_connector(connector: Connector, progress, force: bool = False) -> dict:
+    """
+    Renders the values of the connector again and upgrades its release, unless nothing changed
+    since the last applied values. Runs on a job worker thread.
+    """
+    progress("rendering")
+    plan = plan_upgrade(connector)
+    diff = mask_diff(plan["diff"]) if plan["diff"] is not None else None
+    if not plan["changed"] and not force:
+        logger.info(f"[INIT] Values of {connector.name} are unchanged, skipping the upgrade")
+        return {"message": "No changes, upgrade skipped", "skipped": True, "diff": diff}
+    value_file_name = edcManager.write_edc_values(connector, plan["values"])
+
+    progress("upgrading")
+    response:dict = edcService.upgrade_helm_chart(deployment_name=connector.name, values_files=[value_file_name],
+                                                  namespace=app_configuration.get("clusterConfig",{}).get("namespace", None),
+                                                  chart=edcService.get_chart(edcManager.get_chart_file(connector.version)))
+    databaseManager.add_release_history([build_release_history(connector, "upgrade", response)])
+    if (response.get("status_code", 0) != 200):
+        raise Exception(get_helm_error(response))
+    databaseManager.save_applied_values([(connector.name, connector.version, plan["values"])])
+    release: dict = response.get("data")
+
+    ## Derive the endpoint urls again, the registry and submodel server may have changed
+    progress("registering")
+    connector_db = databaseManager.get_connector_by_name(connector.name)
+    if connector_db is not None:
+        registry = connector.registry.url if connector.registry else connector_db.registry
+        submodel = connector.submodel.url if connector.submodel else connector_db.submodel
+        databaseManager.update_connector_details(connector_db.id, {
+            "registry": registry,
+            "submodel": submodel,
+            "config": {
+                **(connector_db.config or {}),
+                **edcManager.build_connector_urls(connector_db.cp_hostname, registry, submodel)
+            }
+        })
+
+    return {
+        "output": release,
+        "message": release.get("description"),
+        "id": connector_db.id if connector_db is not None else None,
+        "Name": release.get("name"),
+        "Namespace": release.get("namespace"),
+        "Status": release.get("status"),
+        "Revision": release.get("revision"),
+        "skipped": False,
+        "diff": diff
+    }
+
+def provision_connectors(connectors: List[Connector], progress) -> dict:
+    """
+    Deploys a batch of connectors: values are rendered up front, installs run with a bounded
+    concurrency and all new database rows are inserted in one transaction. Runs on a job worker thread.
+    """
+    namespace = app_configuration.get("clusterConfig",{}).get("namespace", None)
+    concurrency = app_configuration.get("deploy", {}).get("bulk_concurrency", 4)
+    results: dict = {connector.name: {"name": connector.name, "status": "pending", "error": None} for connector in connectors}
+
+    progress("rendering")
+    releases = edcService.get_releases(namespace)
+    to_install: list = []
+    for connector in connectors:
+        if connector.name in releases:
+            results[connector.name]["status"] = "exists"
+            continue
+        try:
+            values = edcManager.render_edc(connector)
+            value_file_name = edcManager.write_edc_values(connector, values)
+        except Exception as e:
+            results[connector.name].update(status="failed", error=str(e))
+            continue
+        to_install.append((connector, value_file_name, values))
+
+    def install(item) -> dict:
+        connector, value_file_name, _ = item
+        try:
+            return edcService.install_helm_chart(deployment_name=connector.name,
+                                                 values_files=[value_file_name],
+                                                 namespace=namespace,
+                                                 chart=edcService.get_chart(edcManager.get_chart_file(connector.version)))
+        except Exception as e:
+            return {"status_code": 500, "data": str(e)}
+
+    progress("installing")
+    history: list = []
+    with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="bulk-install") as executor:
+        for (connector, _, _), response in zip(to_install, executor.map(install, to_install)):
+            history.append(build_release_history(connector, "install", response))
+            if response.get("status_code", 0) == 200:
+                results[connector.name]["status"] = "installed"
+            else:
+                results[connector.name].update(status="failed", error=get_helm_error(response))
+
+    progress("registering")
+    databaseManager.add_release_history(history)
+    databaseManager.save_applied_values(
+        (connector.name, connector.version, values) for connector, _, values in to_install
+        if results[connector.name]["status"] == "installed"
+    )
+    deployed = [connector for connector in connectors if results[connector.name]["status"] in ("installed", "exists")]
+    registered = set(databaseManager.get_connector_names([connector.name for connector in deployed]))
+    created = databaseManager.create_connectors(
+        [build_connector_db(connector, namespace) for connector in deployed if connector.name not in registered]
+    )
+    for connector_db in created:
+        results[connector_db.name]["id"] = connector_db.id
+
+    summary: dict = {}
+    for result in results.values():
+        summary[result["status"]] = summary.get(result["status"], 0) + 1
+    return {"summary": summary, "items": list(results.values())}
+
+def submit_deployment_job(job_type: str, connector: Connector, function, **kwargs):
+    active_job = jobManager.get_active_job(connector.name)
+    if active_job is not None:
+        return HttpUtils.response(
+            status=409,
+            message=f"A {active_job['type']} job is already running for {connector.name}",
+            data=active_job
+        )
+    job = jobManager.submit(job_type, connector.name, function, connector=connector, **kwargs)
+    activityManager.log(
+        action=f"{job_type.upper()}_CONNECTOR",
+        details=f"{job_type.capitalize()} of {connector.name} ({connector.version}) submitted as job {job['id']}",
+        connector_name=connector.name,
+        status="submitted"
+    )
+    return HttpUtils.response(
+        status=202,
+        message=f"{job_type.capitalize()} of {connector.name} submitted",
+        data=job
+    )
+
 # ------------------------------------------------------------
 # API ROUTES
 # ------------------------------------------------------------
@@ -115,10 +496,22 @@ def get_health():
         "timestamp": op.timestamp()
     })
 
+@app.get("/metrics")
+def get_metrics():
+    """
+    Prometheus metrics of the backend in the text exposition format
+    """
+    return Response(content=render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
 @app.get("/api/connectors", tags=["EDC"])
-async def list_connectors(request: Request):
+async def list_connectors(request: Request, limit: Optional[int] = None, cursor: Optional[str] = None,
+                          status: Optional[str] = None, namespace: Optional[str] = None,
+                          bpn: Optional[str] = None, version: Optional[str] = None,
+                          sort: str = "created_at", order: str = "desc"):
     """
-    Retrieves list of connectors the user is allowed to see
+    Retrieves list of connectors the user is allowed to see.
+    Without a limit all matching connectors are returned, otherwise the response
+    carries the cursor of the next page under pagination.next_cursor
 
     Returns:
         response: :obj:`data object with the list of connectors`
@@ -128,45 +521,81 @@ async def list_connectors(request: Request):
         if not authManager.is_authenticated(request=request):
             return HttpUtils.get_not_authorized()
 
-        existingDeployments = databaseManager.get_all_connectors()
+        if limit is not None and not 0 < limit <= 500:
+            return HttpUtils.get_error_response(status=400, message="limit must be between 1 and 500")
+        try:
+            existingDeployments, next_cursor = await asyncDatabaseManager.get_connectors_page(
+                filters={"status": status, "namespace": namespace, "bpn": bpn, "version": version},
+                sort=sort, order=order, limit=limit, cursor=cursor
+            )
+        except ValueError as e:
+            return HttpUtils.get_error_response(status=400, message=str(e))
+        ## Served from the health cache, which the background poller keeps warm
+        health_results = await healthManager.check_all(
+            [HealthManager.connector_url(cnctor) for cnctor in existingDeployments]
+        )
         connectorMap: dict = {}
+        changed_statuses: dict = {}
         json_list: list = []
         for cnctor in existingDeployments:
             connectorMap[cnctor.name] = cnctor
-            status = edcManager.check_health('https://' + cnctor.cp_hostname)
+            status = health_results.get(HealthManager.connector_url(cnctor), {})
             logger.info("Health check status %s", status)
-            cnctor.status = "healthy" if status.get("healthy", False) else "unhealthy"
-            databaseManager.update_connector(cnctor)
-            
-            url_list = []
-            for endpoint in app_configuration.get("edc", {}).get("endpoints", {}).keys():
-                url_list.append(
-                    'https://' + cnctor.cp_hostname + app_configuration.get("edc", {}).get("endpoints", {}).get(endpoint)
-                )
-            if len(cnctor.registry) != 0:
-                url_list.append(f'https://{cnctor.registry}/semantics/registry/')
-            if len(cnctor.submodel) != 0:
-                url_list.append(f'https://{cnctor.submodel}/')
+            health_status = "healthy" if status.get("healthy", False) else "unhealthy"
+            if cnctor.status != health_status:
+                cnctor.status = health_status
+                changed_statuses[cnctor.id] = health_status
+
+            ## Endpoint urls are derived when the connector is created or upgraded,
+            ## rows created before that or under another endpoint configuration are migrated once
+            connector_config = cnctor.config or {}
+            if connector_config.get("urls_fingerprint") != edcManager.urls_fingerprint:
+                connector_config = {
+                    **connector_config,
+                    **edcManager.build_connector_urls(cnctor.cp_hostname, cnctor.registry, cnctor.submodel)
+                }
+                cnctor.config = connector_config
+                await asyncDatabaseManager.update_connector_details(cnctor.id, {"config": connector_config})
 
             connector_dict = cnctor.to_dict()
-            connector_dict["urls"] = url_list
+            connector_dict["urls"] = connector_config["urls"]
+            connector_dict["status_checked_at"] = op.from_epoch(status["checked_at"]) if status else None
+            connector_dict["status_age"] = HealthManager.get_age(status) if status else None
             logger.info("Fetching all connectors %s", connector_dict)
             json_list.append(
                 connector_dict
             )
+        await asyncDatabaseManager.update_connector_statuses(changed_statuses)
 
         return HttpUtils.response(
             status=200,
-            data=json_list
+            data=json_list,
+            pagination={"limit": limit, "next_cursor": next_cursor} if limit is not None else None
         )
     except Exception as e:
         logger.exception(str(e))
         return HttpUtils.get_error_response(status=500, message=str(e))
 
+@app.get("/api/connectors/health/cache", tags=["EDC"])
+async def get_health_cache_stats(request: Request):
+    """
+    Retrieves the hit/miss counters of the connector health cache
+
+    Returns:
+        response: :obj:`data object with the cache statistics`
+    """
+    if not authManager.is_authenticated(request=request):
+        return HttpUtils.get_not_authorized()
+
+    return HttpUtils.response(
+        status=200,
+        data=healthManager.get_cache_stats()
+    )
+
 @app.get("/api/connectors/{connector_id}", tags=["EDC"])
-async def get_connector(connector_id: int, user=Depends(keycloak_openid.get_current_user)):
+async def get_connector(connector_id: str, user=Depends(keycloak_openid.get_current_user)):
     try:
-        connector = databaseManager.get_connector_by_id(connector_id)
+        connector = await asyncDatabaseManager.get_connector_by_id(connector_id)
         if not connector:
             return HttpUtils.get_error_response(status=404, message="Connector not found")
         return {
@@ -177,8 +606,152 @@ async def get_connector(connector_id: int, user=Depends(keycloak_openid.get_curr
         logger.exception(str(e))
         return HttpUtils.get_error_response(status=500, message=str(e))
 
+async def stream_connector_query(request: Request, connector_name: str, iter_pages):
+    """
+    Streams every item of a paginated management API query of the connector as a JSON array.
+    The first page is fetched before the response starts, so connection errors still map to a status code.
+    """
+    try:
+        ## Check if the api key is present and if it is authenticated
+        if not authManager.is_authenticated(request=request):
+            return HttpUtils.get_not_authorized()
+
+        connector = await asyncDatabaseManager.get_connector_by_name(name=connector_name)
+        if connector is None:
+            return HttpUtils.get_error_response(status=404, message="Connector not found")
+
+        pages = iter_pages(HealthManager.connector_url(connector))
+        first_page = await asyncio.to_thread(next, pages, [])
+        return HttpUtils.json_stream_response(
+            itertools.chain(first_page, itertools.chain.from_iterable(pages))
+        )
+    except Exception as e:
+        logger.exception(str(e))
+        return HttpUtils.get_error_response(status=502, message=str(e))
+
+@app.get("/api/connectors/{connector_name}/assets", tags=["EDC"])
+async def get_connector_assets(connector_name: str, request: Request):
+    return await stream_connector_query(request, connector_name, edcManager.iter_assets)
+
+@app.get("/api/connectors/{connector_name}/policies", tags=["EDC"])
+async def get_connector_policies(connector_name: str, request: Request):
+    return await stream_connector_query(request, connector_name, edcManager.iter_policies)
+
+@app.get("/api/connectors/{connector_name}/contracts", tags=["EDC"])
+async def get_connector_contracts(connector_name: str, request: Request):
+    return await stream_connector_query(request, connector_name, edcManager.iter_contracts)
+
+@app.get("/api/inventory", tags=["EDC"])
+async def get_inventory(request: Request):
+    """
+    Retrieves the assets, policies and contract definitions of all managed connectors
+
+    Returns:
+        response: :obj:`data object with the merged inventory and a per connector summary`
+    """
+    try:
+        ## Check if the api key is present and if it is authenticated
+        if not authManager.is_authenticated(request=request):
+            return HttpUtils.get_not_authorized()
+
+        connectors = await asyncDatabaseManager.get_all_connectors()
+        inventory = await inventoryManager.get_inventory(connectors)
+        return HttpUtils.response(
+            status=200,
+            data=inventory
+        )
+    except Exception as e:
+        logger.exception(str(e))
+        return HttpUtils.get_error_response(status=500, message=str(e))
+
+@app.post("/api/connectors/{connector_name}/catalog", tags=["Catalog"])
+async def request_catalog(connector_name: str, catalog_request: CatalogRequest, request: Request):
+    """
+    Requests the catalog of a counterparty through one of the managed connectors
+
+    Returns:
+        response: :obj:`data object with the catalog, the cache state (hit, stale or miss) and its age`
+    """
+    try:
+        ## Check if the api key is present and if it is authenticated
+        if not authManager.is_authenticated(request=request):
+            return HttpUtils.get_not_authorized()
+
+        connector = await asyncDatabaseManager.get_connector_by_name(name=connector_name)
+        if connector is None:
+            return HttpUtils.get_error_response(status=404, message="Connector not found")
+
+        connector_url = HealthManager.connector_url(connector)
+        catalog, cache_state = await catalogManager.get_catalog(
+            connector_url=connector_url,
+            counter_party_id=catalog_request.counter_party_id,
+            counter_party_address=catalog_request.counter_party_address,
+            query_spec=catalog_request.query_spec,
+            refresh=catalog_request.refresh
+        )
+        cache_age = catalogManager.cache.get_age(CatalogManager.cache_key(
+            connector_url, catalog_request.counter_party_id,
+            catalog_request.counter_party_address, catalog_request.query_spec
+        ))
+        return HttpUtils.response(
+            status=200,
+            data={
+                "catalog": catalog,
+                "cache": cache_state,
+                "cache_age": round(cache_age, 3) if cache_age is not None else None
+            }
+        )
+    except Exception as e:
+        logger.exception(str(e))
+        return HttpUtils.get_error_response(status=502, message=str(e))
+
+@app.get("/api/catalog/cache", tags=["Catalog"])
+async def get_catalog_cache_stats(request: Request):
+    if not authManager.is_authenticated(request=request):
+        return HttpUtils.get_not_authorized()
+
+    return HttpUtils.response(
+        status=200,
+        data=catalogManager.get_cache_stats()
+    )
+
+@app.delete("/api/catalog/cache", tags=["Catalog"])
+async def invalidate_catalog_cache(request: Request, connector_name: Optional[str] = None,
+                                   counter_party_id: Optional[str] = None):
+    """
+    Drops cached catalogs, optionally only those of one connector and/or counterparty
+
+    Returns:
+        response: :obj:`number of invalidated entries`
+    """
+    try:
+        if not authManager.is_authenticated(request=request):
+            return HttpUtils.get_not_authorized()
+
+        connector_url = None
+        if connector_name is not None:
+            connector = await asyncDatabaseManager.get_connector_by_name(name=connector_name)
+            if connector is None:
+                return HttpUtils.get_error_response(status=404, message="Connector not found")
+            connector_url = HealthManager.connector_url(connector)
+
+        invalidated = catalogManager.invalidate(connector_url=connector_url, counter_party_id=counter_party_id)
+        return HttpUtils.response(
+            status=200,
+            data={"invalidated": invalidated}
+        )
+    except Exception as e:
+        logger.exception(str(e))
+        return HttpUtils.get_error_response(status=500, message=str(e))
+
 @app.post("/api/connector", tags=["EDC"])
 async def add_connector(connector: Connector, request: Request):
+    """
+    Submits the deployment of a connector as a job
+
+    Returns:
+        response: :obj:`202 with the queued job, poll /api/jobs/{job_id} for its progress`
+    """
     try:
         ## Check if the api key is present and if it is authenticated
         if not authManager.is_authenticated(request=request):
@@ -187,61 +760,56 @@ async def add_connector(connector: Connector, request: Request):
         #Check if the user has more than 2 edcs already deployed, maybe create another endpoint for user check
         #We can then call the endpoint when the user clicks on the DeployEDC button itself.
         logger.info(connector)
-        is_registry_enabled = len(connector.registry.url) != 0
-        is_submodel_enabled = len(connector.submodel.url) != 0
-       
-        existingDeployments = edcService.get_connector_by_name(
-            connector_name=connector.name,
-            namespace=app_configuration.get("clusterConfig",{}).get("namespace", None)
-        )
-        if existingDeployments.get("status_code") != 200:
-            # set edc helm chart directory
-            value_file_name = edcManager.add_edc(
-                connector,
-                is_registry_enabled=is_registry_enabled,
-                is_submodel_enabled=is_submodel_enabled
-            )
-            response: dict = edcService.install_helm_chart(deployment_name=connector.name,
-                                                           values_files=[value_file_name],
-                                                           namespace=app_configuration.get("clusterConfig",{}).get("namespace", None)
-                                                        )
-            if (response.get("status_code", 0) != 200):
-                raise Exception(response.get("data",{}).split('Error')[1])
-
-        connector_db = databaseManager.get_connector_by_name(connector.name)
-        if connector_db is None:
-            logger.info(f"Entry not found in database, creating entry for {connector.name}")
-
-            # dtr_db = DigitalTwinRegistryDB(
-            #     url=connector.registry.url,
-            #     credentials=connector.registry.credentials
-            # )
-
-            # submodel_db = SubModelServerDB(
-            #     url=connector.submodel.url,
-            #     credentials=connector.submodel.credentials
-            # )
-            connector_db = ConnectorDB(
-                id=str(uuid.uuid4()),
-                name=connector.name,
-                bpn=connector.bpn,
-                url = connector.url,
-                version = connector.version,
-                namespace = app_configuration.get("clusterConfig", {}).get("namespace", None),
-                status = "unhealthy",
-                cp_hostname = connector.name + '-' + app_configuration.get("edc", {}).get("hostname", {}).get("cp"),
-                dp_hostname = connector.name + '-' + app_configuration.get("edc", {}).get("hostname", {}).get("dp"),
-                db_name = 'edc',
-                db_username = connector.db_username,
-                db_password = connector.db_password,
-                registry=connector.registry.url,
-                submodel=connector.submodel.url
-            )
-            connector_db = databaseManager.create_connector(connector=connector_db)
+        errors = edcManager.validate_connector(connector)
+        if errors:
+            return HttpUtils.response(status=422, message="Invalid connector, nothing was deployed", data=errors)
+        return submit_deployment_job("install", connector, deploy_connector)
+
+    except Exception as e:
+        logger.exception(str(e))
+        return HttpUtils.get_error_response(status=500, message=str(e))
 
+@app.post("/api/connectors/bulk", tags=["EDC"])
+async def add_connectors(connectors: List[Connector], request: Request):
+    """
+    Submits the deployment of a list of connectors as a single job.
+    All connectors are validated first, nothing is deployed when any of them is invalid
+
+    Returns:
+        response: :obj:`202 with the queued job, its result lists the outcome per connector`
+    """
+    try:
+        ## Check if the api key is present and if it is authenticated
+        if not authManager.is_authenticated(request=request):
+            return HttpUtils.get_not_authorized()
+
+        if not connectors:
+            return HttpUtils.get_error_response(status=400, message="No connectors given")
+
+        names = [connector.name for connector in connectors]
+        errors: list = []
+        for connector in connectors:
+            connector_errors = edcManager.validate_connector(connector)
+            if names.count(connector.name) > 1:
+                connector_errors.append("name is used more than once in the request")
+            if jobManager.get_active_job(connector.name) is not None:
+                connector_errors.append("a deployment job is already running for this connector")
+            if connector_errors:
+                errors.append({"name": connector.name, "errors": connector_errors})
+        if errors:
+            return HttpUtils.response(status=422, message="Invalid connectors, nothing was deployed", data=errors)
+
+        job = jobManager.submit("bulk-install", f"bulk-{len(connectors)}", provision_connectors,
+                                targets=names, connectors=connectors)
+        activityManager.log(
+            action="BULK_INSTALL_CONNECTOR",
+            details=f"Install of {len(connectors)} connectors submitted as job {job['id']}: {', '.join(names)}",
+            status="submitted"
+        )
         return HttpUtils.response(
-            status=200,
-            data=connector_db.to_dict()
+            status=202,
+            message=f"Install of {len(connectors)} connectors submitted",
+            data=job
         )
 
     except Exception as e:
@@ -249,35 +817,120 @@ async def add_connector(connector: Connector, request: Request):
         return HttpUtils.get_error_response(status=500, message=str(e))
 
 @app.put("/api/connectors/{connector_id}", tags=["EDC"])
-async def upgrade_connector(connector_id: str, connector: Connector, request: Request):
+async def upgrade_connector(connector_id: str, connector: Connector, request: Request,
+                            dry_run: bool = False, force: bool = False):
+    """
+    Submits the upgrade of a connector as a job, the job skips the upgrade when the rendered values did not change.
+    With dry_run the diff against the applied values is returned right away without touching the cluster,
+    force upgrades even when nothing changed.
+
+    Returns:
+        response: :obj:`202 with the queued job, poll /api/jobs/{job_id} for its progress. 200 with the diff on dry_run`
+    """
     try:
         ## Check if the api key is present and if it is authenticated
         if not authManager.is_authenticated(request=request):
             return HttpUtils.get_not_authorized()
 
-        # set edc helm chart directory
-        edcManager.upgrade_edc(connector)
-        ##edcService = EdcService(helm_chart_directory=app_configuration.get("edc",{}).get("helm_chart_directory", None))
-        response:dict = edcService.upgrade_helm_chart(deployment_name=connector.connector_name, values_files=["upgrade_values.yaml"],namespace=app_configuration.get("clusterConfig",{}).get("namespace", None))
-        if (response.get("status_code", 0) != 200):
-            raise Exception(response.get("data",{}).split('Error')[1])
-        data: dict = response.get("data", {}).split("\n")
+        errors = edcManager.validate_connector(connector)
+        if errors:
+            return HttpUtils.response(status=422, message="Invalid connector, nothing was upgraded", data=errors)
+
+        if dry_run:
+            plan: dict = await asyncio.to_thread(plan_upgrade, connector)
+            return HttpUtils.response(
+                status=200,
+                message="Upgrade would change the connector" if plan["changed"] else "No changes",
+                data={
+                    "changed": plan["changed"],
+                    "reason": plan["reason"],
+                    "diff": mask_diff(plan["diff"]) if plan["diff"] is not None else None
+                }
+            )
 
+        return submit_deployment_job("upgrade", connector, redeploy_connector, force=force)
+
+    except Exception as e:
+        logger.exception(str(e))
+        return HttpUtils.get_error_response(status=500, message=str(e))
+
+@app.get("/api/connectors/{connector_name}/history", tags=["EDC"])
+async def get_connector_history(connector_name: str, request: Request,
+                                limit: int = 50, before: Optional[int] = None):
+    """
+    Retrieves the helm install and upgrade history of a connector, newest first
+
+    Returns:
+        response: :obj:`list of revision, chart version, duration and outcome per helm run, pass the last id as before for the next page`
+    """
+    try:
+        if not authManager.is_authenticated(request=request):
+            return HttpUtils.get_not_authorized()
+
+        if limit < 1 or limit > 500:
+            return HttpUtils.get_error_response(status=400, message="limit must be between 1 and 500")
+
+        history = await asyncDatabaseManager.get_release_history(connector_name, limit, before)
         return HttpUtils.response(
             status=200,
-            message=str(data[0]),
-            data={
-                "id": str(uuid.uuid4()),
-                "Name": str(data[1].split()[1]),
-                "Namespace": str(data[3].split()[1]),
-                "Status": str(data[4].split()[1]),
-                "Revision": str(data[5].split()[1])
-            })
+            data=[entry.to_dict() for entry in history],
+            pagination={"limit": limit, "next_before": history[-1].id if len(history) == limit else None}
+        )
 
     except Exception as e:
         logger.exception(str(e))
         return HttpUtils.get_error_response(status=500, message=str(e))
 
+@app.get("/api/releases", tags=["EDC"])
+async def list_releases(request: Request):
+    """
+    Retrieves the helm releases of the cluster namespace from the release index
+
+    Returns:
+        response: :obj:`data object with name, status, chart version and revision of each release`
+    """
+    if not authManager.is_authenticated(request=request):
+        return HttpUtils.get_not_authorized()
+
+    response: dict = await asyncio.to_thread(
+        edcService.get_all_connectors, app_configuration.get("clusterConfig",{}).get("namespace", None)
+    )
+    if response.get("status_code") != 200:
+        return HttpUtils.get_error_response(status=500, message=str(response.get("data")))
+    return HttpUtils.response(
+        status=200,
+        data=response.get("data")
+    )
+
+@app.get("/api/jobs", tags=["Jobs"])
+async def list_jobs(request: Request):
+    if not authManager.is_authenticated(request=request):
+        return HttpUtils.get_not_authorized()
+
+    return HttpUtils.response(
+        status=200,
+        data=jobManager.get_jobs()
+    )
+
+@app.get("/api/jobs/{job_id}", tags=["Jobs"])
+async def get_job(job_id: str, request: Request):
+    """
+    Retrieves the phase, duration and helm output of a deployment job
+
+    Returns:
+        response: :obj:`data object with the job`
+    """
+    if not authManager.is_authenticated(request=request):
+        return HttpUtils.get_not_authorized()
+
+    job = jobManager.get_job(job_id)
+    if job is None:
+        return HttpUtils.get_error_response(status=404, message="Job not found")
+    return HttpUtils.response(
+        status=200,
+        data=job
+    )
+
 @app.delete("/api/connectors/{connector_name}", tags=["EDC"])
 async def delete_connector(connector_name: str, request: Request):
 
@@ -286,13 +939,36 @@ async def delete_connector(connector_name: str, request: Request):
         if not authManager.is_authenticated(request=request):
             return HttpUtils.get_not_authorized()
 
-        connector = databaseManager.get_connector_by_name(name=connector_name)
+        connector = await asyncDatabaseManager.get_connector_by_name(name=connector_name)
+        if connector is None:
+            return HttpUtils.get_error_response(status=404, message="Connector not found")
 
-        response:dict = edcService.uninstall_helm_chart(connector_id=connector.name, namespace=app_configuration.get("clusterConfig",{}).get("namespace", None))
-        if (response.get("status_code", 0) != 200):
-            raise Exception(response.get("data",{}).split('Error')[1])
+        ## A running install or upgrade would write the connector back after the release was removed
+        active_job = jobManager.get_active_job(connector.name)
+        if active_job is not None:
+            return HttpUtils.get_error_response(
+                status=409,
+                message=f"A {active_job['type']} job is already running for {connector.name}"
+            )
 
-        databaseManager.delete_connector(connector_id=connector.id)
+        ## helm waits on the release lock, run it off the event loop
+        response:dict = await asyncio.to_thread(
+            edcService.uninstall_helm_chart,
+            connector_id=connector.name,
+            namespace=app_configuration.get("clusterConfig",{}).get("namespace", None)
+        )
+        if (response.get("status_code", 0) != 200):
+            error = str(response.get("data", ""))
+            raise Exception(error.split('Error')[1] if 'Error' in error else error)
+
+        await asyncDatabaseManager.delete_connector(connector_id=connector.id)
+        activityManager.log(
+            action="DELETE_CONNECTOR",
+            details=f"Connector {connector.name} uninstalled",
+            connector_id=connector.id,
+            connector_name=connector.name,
+            status="success"
+        )
 
         return HttpUtils.response(
             status=200,
@@ -326,7 +1002,7 @@ async def add_submodel_service(data: dict, user=Depends(keycloak_openid.get_curr
         if not url:
             return HttpUtils.get_error_response(status=400, message="URL is required")
 
-        database_manager.log_activity(
+        activityManager.log(
             action="DEPLOY_SUBMODEL",
             details=f"Submodel service deployed by {user['preferred_username']}: {url} | Auth: {auth_config['authType']}",
             status="success"
@@ -381,7 +1057,7 @@ async def add_existing_submodel_service(data: dict, user=Depends(keycloak_openid
         except Exception:
             reachable = False
 
-        database_manager.log_activity(
+        activityManager.log(
             action="CONNECT_SUBMODEL",
             details=f"Existing submodel service connected by {user['preferred_username']}: {url} (BPN: {bpn})",
             status="success" if reachable else "warning"
@@ -402,17 +1078,142 @@ async def add_existing_submodel_service(data: dict, user=Depends(keycloak_openid
         logger.exception(str(e))
         return HttpUtils.get_error_response(status=500, message=str(e))
 
-# @app.get("/api/logs", tags=["Logs"])
-# async def get_activity(limit: int = 20, user=Depends(keycloak_openid.get_current_user)):
-#     try:
-#         logs = activity_manager.get_recent_logs(limit)
-#         return {
-#             "user": user["preferred_username"],
-#             "data": logs
-#         }
-#     except Exception as e:
-#         logger.exception(str(e))
-#         return HttpUtils.get_error_response(status=500, message=str(e))
+@app.get("/api/logs/summary", tags=["Logs"])
+async def get_activity_summary(request: Request, granularity: str = "hour", since: Optional[datetime] = None,
+                               until: Optional[datetime] = None, connector: Optional[str] = None):
+    """
+    Activity counts per hour or day, action, status and connector, read from the rollup tables.
+    Without since the last 24 hours (granularity hour) or 30 days (granularity day) are returned
+
+    Returns:
+        response: :obj:`series of rollup buckets and the totals per action, status and connector`
+    """
+    try:
+        if not authManager.is_authenticated(request=request):
+            return HttpUtils.get_not_authorized()
+
+        if granularity not in SUMMARY_WINDOWS:
+            return HttpUtils.get_error_response(status=400, message="granularity must be hour or day")
+        since = op.to_utc(since) or datetime.utcnow() - SUMMARY_WINDOWS[granularity]
+        until = op.to_utc(until)
+        rollups = await asyncDatabaseManager.get_activity_rollups(granularity, since, until, connector)
+
+        totals: dict = {"total": 0, "by_action": {}, "by_status": {}, "by_connector": {}}
+        for rollup in rollups:
+            totals["total"] += rollup.count
+            for group, value in (("by_action", rollup.action), ("by_status", rollup.status),
+                                 ("by_connector", rollup.connector_name)):
+                key = value or "none"
+                totals[group][key] = totals[group].get(key, 0) + rollup.count
+        return HttpUtils.response(
+            status=200,
+            data={
+                "granularity": granularity,
+                "since": since.isoformat(),
+                "until": until.isoformat() if until else None,
+                "series": [rollup.to_dict() for rollup in rollups],
+                "totals": totals
+            }
+        )
+    except Exception as e:
+        logger.exception(str(e))
+        return HttpUtils.get_error_response(status=500, message=str(e))
+
+@app.get("/api/logs", tags=["Logs"])
+async def get_activity(request: Request, limit: int = 50, cursor: Optional[str] = None,
+                       connector: Optional[str] = None, action: Optional[str] = None, status: Optional[str] = None):
+    """
+    Retrieves the activity log newest first, filtered by connector name, action and status.
+    The response carries the cursor of the next page under pagination.next_cursor
+
+    Returns:
+        response: :obj:`data object with the activity entries`
+    """
+    try:
+        if not authManager.is_authenticated(request=request):
+            return HttpUtils.get_not_authorized()
+
+        if not 0 < limit <= 500:
+            return HttpUtils.get_error_response(status=400, message="limit must be between 1 and 500")
+        try:
+            activities, next_cursor = await asyncDatabaseManager.get_activities_page(
+                filters={"connector_name": connector, "action": action, "status": status},
+                limit=limit, cursor=cursor
+            )
+        except ValueError as e:
+            return HttpUtils.get_error_response(status=400, message=str(e))
+        return HttpUtils.response(
+            status=200,
+            data=[activity.to_dict() for activity in activities],
+            pagination={"limit": limit, "next_cursor": next_cursor}
+        )
+    except Exception as e:
+        logger.exception(str(e))
+        return HttpUtils.get_error_response(status=500, message=str(e))
+
+@app.get("/api/logs/stats", tags=["Logs"])
+async def get_activity_stats(request: Request):
+    """
+    Retrieves the counters of the activity writer and the live tail
+
+    Returns:
+        response: :obj:`data object with the queued, written, dropped and missed entries`
+    """
+    if not authManager.is_authenticated(request=request):
+        return HttpUtils.get_not_authorized()
+
+    return HttpUtils.response(
+        status=200,
+        data=activityManager.get_stats()
+    )
+
+@app.get("/api/logs/stream", tags=["Logs"])
+async def stream_activity(request: Request, connector: Optional[str] = None, action: Optional[str] = None,
+                          status: Optional[str] = None):
+    """
+    Live tail of the activity log as Server-Sent Events, every entry is sent once it was written.
+    A reconnecting client sends the Last-Event-ID header and first receives the entries it missed
+
+    Returns:
+        response: :obj:`text/event-stream of activity entries`
+    """
+    if not authManager.is_authenticated(request=request):
+        return HttpUtils.get_not_authorized()
+
+    last_event_id = request.headers.get("last-event-id")
+    if last_event_id is not None and not last_event_id.isdigit():
+        return HttpUtils.get_error_response(status=400, message="Last-Event-ID must be an activity id")
+    filters = {"connector_name": connector, "action": action, "status": status}
+
+    async def events():
+        ## Subscribed before the replay so nothing written in between is lost, duplicates are skipped by id
+        subscription = activityManager.subscribe()
+        try:
+            last_id = int(last_event_id) if last_event_id is not None else 0
+            ## The replay is read in chunks until it caught up with the log, the subscription takes over from there
+            replaying = last_event_id is not None
+            while replaying:
+                activities = await asyncDatabaseManager.get_activities_after(last_id, filters, REPLAY_CHUNK)
+                for activity in activities:
+                    last_id = activity.id
+                    yield activity.to_dict()
+                replaying = len(activities) == REPLAY_CHUNK
+            while not await request.is_disconnected():
+                try:
+                    entry = await asyncio.wait_for(subscription.get(), timeout=STREAM_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if entry["id"] <= last_id:
+                    continue
+                if any(value is not None and entry.get(field) != value for field, value in filters.items()):
+                    continue
+                last_id = entry["id"]
+                yield entry
+        finally:
+            activityManager.unsubscribe(subscription)
+
+    return HttpUtils.event_stream_response(events())
 
 @app.get("/api/config", tags=["Config"])
 async def get_config(user=Depends(keycloak_openid.get_current_user)):
@@ -482,7 +1283,7 @@ async def get_dataspace_settings(request: Request):
 
 
 def init_app(host: str, port: int, log_level: str = "info"):
-    global app, app_configuration, edcService, edcManager, edcDiscoveryService, discoveryFinderService, authManager, databaseManager
+    global app, app_configuration, edcService, edcManager, edcDiscoveryService, discoveryFinderService, authManager, databaseManager, asyncDatabaseManager, activityManager, healthManager, inventoryManager, catalogManager, jobManager, httpClient
 
     ## API Key Authorization
     authManager = AuthManager()
@@ -494,7 +1295,24 @@ def init_app(host: str, port: int, log_level: str = "info"):
         authManager = AuthManager(api_key_header=api_key.get("key", "X-Api-Key"),
                                 configured_api_key=api_key.get("value", "password"), auth_enabled=True)
 
-    edcService = EdcService(helm_chart_directory=app_configuration.get("edc",{}).get("helm_chart_directory", None))
+    ## Shared connection pooled client for the connector management APIs
+    http_config: dict = app_configuration.get("http", {})
+    httpClient = HttpClient(
+        pool_size=http_config.get("pool_size", 10),
+        keep_alive=http_config.get("keep_alive", True),
+        connect_timeout=http_config.get("connect_timeout", 5),
+        read_timeout=http_config.get("read_timeout", 30),
+        retries=http_config.get("retries", 2),
+        backoff_factor=http_config.get("backoff_factor", 0.3)
+    )
+
+    edcService = EdcService(
+        helm_chart_directory=app_configuration.get("edc",{}).get("helm_chart_directory", None),
+        http_client=httpClient,
+        dependency_cache_directory=app_configuration.get("edc",{}).get("dependency_cache_directory", "./data/helm-dependencies"),
+        chart_cache_directory=app_configuration.get("edc",{}).get("chart_cache_directory", "./data/helm-charts"),
+        release_index_ttl=app_configuration.get("edc",{}).get("release_index_ttl", 30)
+    )
 
     ## Get environment specific configurations
     cluster_config: dict = app_configuration["clusterConfig"]
@@ -505,11 +1323,54 @@ def init_app(host: str, port: int, log_level: str = "info"):
         cluster_config=cluster_config,
         edc_config=edc_config,
         dataspace_config=app_configuration.get("dataspaceConfig",{}),
-        files_config=file_config
+        files_config=file_config,
+        http_client=httpClient
     )
 
     ## Initialize database manager
-    databaseManager = DatabaseManager(database_url="sqlite:///edc_manager.db")
+    database_config: dict = app_configuration.get("database", {})
+    databaseManager = DatabaseManager(database_url=database_config.get("url"), database_config=database_config)
+    asyncDatabaseManager = AsyncDatabaseManager(database_url=database_config.get("url"), database_config=database_config)
+    activity_config: dict = app_configuration.get("activity", {})
+    activityManager = ActivityManager(
+        database_manager=databaseManager,
+        batch_size=activity_config.get("batch_size", 100),
+        flush_interval=activity_config.get("flush_interval", 1.0),
+        max_queue=activity_config.get("max_queue", 10000),
+        stream_queue=activity_config.get("stream_queue", 1000)
+    )
+
+    ## Initialize the concurrent connector health prober
+    health_config: dict = app_configuration.get("health", {})
+    healthManager = HealthManager(
+        edc_manager=edcManager,
+        database_manager=asyncDatabaseManager,
+        max_concurrency=health_config.get("max_concurrency", 16),
+        cache_ttl=health_config.get("cache_ttl", 15)
+    )
+
+    ## Initialize the deployment job workers
+    deploy_config: dict = app_configuration.get("deploy", {})
+    jobManager = JobManager(
+        max_workers=deploy_config.get("max_workers", 4),
+        max_history=deploy_config.get("max_history", 200)
+    )
+
+    ## Initialize the cached catalog requests
+    catalog_config: dict = app_configuration.get("catalog", {})
+    catalogManager = CatalogManager(
+        edc_service=edcService,
+        catalog_endpoint=edc_config.get("endpoints", {}).get("catalog", "/management/v3/catalog/request"),
+        cache_ttl=catalog_config.get("cache_ttl", 300),
+        stale_ttl=catalog_config.get("stale_ttl", 600),
+        max_entries=catalog_config.get("max_entries", 256)
+    )
+
+    ## Initialize the cross-connector inventory aggregator
+    inventoryManager = InventoryManager(
+        edc_manager=edcManager,
+        max_concurrency=app_configuration.get("inventory", {}).get("max_concurrency", 16)
+    )
 
     app.add_middleware(
         CORSMiddleware,
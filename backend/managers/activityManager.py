@@ -0,0 +1,197 @@
+import asyncio
+import gzip
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from managers.databaseManager import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+
+class ActivityManager:
+    """
+        Write-behind activity log. log() only puts the event on an in-process queue, a background writer
+        inserts the queued events in batches, as soon as batch_size events are waiting or flush_interval seconds
+        after the first one arrived. Pending events are written on shutdown. When the queue is full new events
+        are dropped and counted instead of slowing down the caller.
+        Written events are also published to the subscribers of the live tail, each one gets its own
+        bounded asyncio queue and misses events while its queue is full.
+    """
+    def __init__(self, database_manager: DatabaseManager, batch_size: int = 100,
+                 flush_interval: float = 1.0, max_queue: int = 10000, stream_queue: int = 1000):
+        self.database_manager = database_manager
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.stream_queue = stream_queue
+        self.queue: "queue.Queue[Optional[Dict]]" = queue.Queue(maxsize=max_queue)
+        self.subscribers: Dict[asyncio.Queue, asyncio.AbstractEventLoop] = {}
+        self.subscribers_lock = threading.Lock()
+        self.dropped = 0
+        self.missed = 0
+        self.written = 0
+        self.flushes = 0
+        self.writer = threading.Thread(target=self.run, name="activity-writer", daemon=True)
+        self.writer.start()
+
+    @staticmethod
+    def as_uuid(connector_id: Optional[str]) -> Optional[uuid.UUID]:
+        try:
+            return uuid.UUID(str(connector_id)) if connector_id is not None else None
+        except ValueError:
+            return None
+
+    def log(self, action: str, details: Optional[str] = None, connector_id: Optional[str] = None,
+            connector_name: Optional[str] = None, status: Optional[str] = None):
+        event = {
+            "connector_id": self.as_uuid(connector_id),
+            "connector_name": connector_name,
+            "action": action,
+            "details": details,
+            "status": status,
+            "timestamp": datetime.utcnow()
+        }
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+            logger.warning(f"[ActivityManager] Activity queue is full, dropped {action}")
+
+    def next_batch(self) -> List[Optional[Dict]]:
+        """
+        Blocks until an event arrives, then collects events until the batch is full or the flush interval passed.
+        """
+        batch = [self.queue.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while batch[-1] is not None and len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def run(self):
+        try:
+            self.database_manager.rebuild_activity_rollups()
+        except Exception as e:
+            logger.error(f"[ActivityManager] Rebuilding the activity rollups failed: {str(e)}")
+        stopping = False
+        while not stopping:
+            batch = self.next_batch()
+            if batch[-1] is None:
+                stopping = True
+                batch.pop()
+            self.flush(batch)
+
+    def flush(self, events: List[Dict]):
+        if not events:
+            return
+        try:
+            activity_ids = self.database_manager.add_activities(events)
+            self.written += len(events)
+            self.flushes += 1
+        except Exception as e:
+            logger.error(f"[ActivityManager] Writing {len(events)} activity events failed: {str(e)}")
+            return
+        self.publish([
+            {
+                **event,
+                "id": activity_id,
+                "connector_id": str(event["connector_id"]) if event["connector_id"] else None,
+                "timestamp": event["timestamp"].isoformat()
+            }
+            for activity_id, event in zip(activity_ids, events)
+        ])
+
+    def subscribe(self) -> asyncio.Queue:
+        """
+        Registers a live tail on the running event loop, the returned queue receives the written entries.
+        """
+        subscription: asyncio.Queue = asyncio.Queue(maxsize=self.stream_queue)
+        with self.subscribers_lock:
+            self.subscribers[subscription] = asyncio.get_running_loop()
+        return subscription
+
+    def unsubscribe(self, subscription: asyncio.Queue):
+        with self.subscribers_lock:
+            self.subscribers.pop(subscription, None)
+
+    def publish(self, entries: List[Dict]):
+        with self.subscribers_lock:
+            subscribers: List[Tuple[asyncio.Queue, asyncio.AbstractEventLoop]] = list(self.subscribers.items())
+        for subscription, loop in subscribers:
+            try:
+                loop.call_soon_threadsafe(self.deliver, subscription, entries)
+            except RuntimeError:
+                ## The loop of the subscriber is closed
+                self.unsubscribe(subscription)
+
+    def deliver(self, subscription: asyncio.Queue, entries: List[Dict]):
+        for entry in entries:
+            try:
+                subscription.put_nowait(entry)
+            except asyncio.QueueFull:
+                self.missed += 1
+
+    @staticmethod
+    def archive_file(archive_directory: str, day: date) -> str:
+        return os.path.join(archive_directory, f"activity-{day.isoformat()}.jsonl.gz")
+
+    def apply_retention(self, retention_days: int, archive_directory: str,
+                        hourly_rollup_days: Optional[int] = None, chunk_size: int = 5000) -> int:
+        """
+        Moves activity rows older than retention_days into one gzip compressed JSON lines file per day
+        and removes hourly rollups older than hourly_rollup_days, the daily rollups are kept.
+        A chunk is deleted only after it was written and synced to its archive file, if the process stops
+        in between the chunk is archived a second time on the next run.
+
+        Returns:
+            int: number of archived activity rows
+        """
+        cutoff = datetime.utcnow() - timedelta(days=retention_days)
+        os.makedirs(archive_directory, exist_ok=True)
+        archived = 0
+        while True:
+            activities = self.database_manager.get_activities_before(cutoff, chunk_size)
+            if not activities:
+                break
+            days: Dict[date, List[Dict]] = {}
+            for activity in activities:
+                days.setdefault(activity.timestamp.date(), []).append(activity.to_dict())
+            for day, entries in days.items():
+                ## Every append is a gzip member of its own, gzip readers concatenate them
+                with open(self.archive_file(archive_directory, day), "ab") as file:
+                    with gzip.GzipFile(fileobj=file, mode="wb") as archive:
+                        archive.write("".join(json.dumps(entry, default=str) + "\n" for entry in entries).encode())
+                    file.flush()
+                    os.fsync(file.fileno())
+            archived += self.database_manager.delete_activities([activity.id for activity in activities])
+        if hourly_rollup_days:
+            self.database_manager.delete_hourly_rollups_before(datetime.utcnow() - timedelta(days=hourly_rollup_days))
+        if archived:
+            logger.info(f"[ActivityManager] Archived {archived} activities older than {cutoff.isoformat()}")
+        return archived
+
+    def get_stats(self) -> Dict:
+        return {
+            "queued": self.queue.qsize(),
+            "written": self.written,
+            "flushes": self.flushes,
+            "dropped": self.dropped,
+            "subscribers": len(self.subscribers),
+            "missed": self.missed
+        }
+
+    def shutdown(self, timeout: float = 10):
+        ## The stop marker is queued behind all pending events, so they are written first
+        self.queue.put(None)
+        self.writer.join(timeout=timeout)
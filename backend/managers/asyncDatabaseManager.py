@@ -0,0 +1,176 @@
+import logging
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from managers.databaseManager import DatabaseManager
+from models.database import (ConnectorDB, ConnectorValuesDB, ReleaseHistoryDB, ActivityLog, ActivityRollup,
+                             ActivityRollupHourlyDB, ActivityRollupDailyDB)
+from utilities.metrics import db_session_duration
+
+logger = logging.getLogger(__name__)
+
+## Async drivers replacing the sync driver of the configured url
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+ROLLUP_MODELS = {"hour": ActivityRollupHourlyDB, "day": ActivityRollupDailyDB}
+
+
+class AsyncDatabaseManager:
+    """
+        Asyncio counterpart of DatabaseManager for the request handlers, queries await the database
+        instead of blocking the event loop. It shares the models, the engine configuration and the query
+        statements with DatabaseManager, which stays in use for jobs running on worker threads and scripts
+        and creates the tables.
+    """
+    def __init__(self, database_url: str, database_config: Optional[Dict] = None):
+        self.database_config = database_config or {}
+        self.database_url = self.async_url(DatabaseManager.resolve_url(database_url))
+        self.engine = self.build_engine(self.database_url, self.database_config)
+        self.SessionLocal = async_sessionmaker(self.engine, autoflush=False, expire_on_commit=False)
+
+    @staticmethod
+    def async_url(database_url: str) -> str:
+        url = make_url(database_url)
+        driver = ASYNC_DRIVERS.get(url.get_backend_name())
+        if driver is None or url.get_driver_name() == driver:
+            return database_url
+        return url.set(drivername=f"{url.get_backend_name()}+{driver}").render_as_string(hide_password=False)
+
+    @staticmethod
+    def build_engine(database_url: str, database_config: Dict) -> AsyncEngine:
+        engine = create_async_engine(database_url, **DatabaseManager.engine_options(database_url, database_config))
+        if database_url.startswith("sqlite"):
+            DatabaseManager.configure_sqlite(engine.sync_engine, database_config)
+        return engine
+
+    @asynccontextmanager
+    async def get_session(self, operation: str = "unknown") -> AsyncIterator[AsyncSession]:
+        opened_at = time.monotonic()
+        try:
+            async with self.SessionLocal() as session:
+                yield session
+        finally:
+            db_session_duration.labels(operation=operation).observe(time.monotonic() - opened_at)
+
+    async def get_connector_by_id(self, connector_id: str) -> Optional[ConnectorDB]:
+        async with self.get_session("get_connector_by_id") as session:
+            return await session.get(ConnectorDB, connector_id)
+
+    async def get_connector_by_name(self, name: str) -> Optional[ConnectorDB]:
+        async with self.get_session("get_connector_by_name") as session:
+            return (await session.execute(select(ConnectorDB).where(ConnectorDB.name == name))).scalars().first()
+
+    async def get_all_connectors(self) -> List[ConnectorDB]:
+        async with self.get_session("get_all_connectors") as session:
+            return list((await session.execute(select(ConnectorDB))).scalars().all())
+
+    async def get_connectors_page(self, filters: Optional[Dict[str, str]] = None, sort: str = "created_at",
+                                  order: str = "desc", limit: Optional[int] = None,
+                                  cursor: Optional[str] = None) -> Tuple[List[ConnectorDB], Optional[str]]:
+        """
+        Same keyset pagination as DatabaseManager.get_connectors_page.
+        """
+        statement = DatabaseManager.connectors_page_statement(filters, sort, order, limit, cursor)
+        async with self.get_session("get_connectors_page") as session:
+            connectors = (await session.execute(statement)).scalars().all()
+        return DatabaseManager.paginate(connectors, sort, limit)
+
+    async def update_connector_details(self, connector_id: str, values: Dict) -> bool:
+        async with self.get_session("update_connector_details") as session:
+            async with session.begin():
+                result = await session.execute(
+                    update(ConnectorDB)
+                    .where(ConnectorDB.id == connector_id)
+                    .values(**values)
+                    .execution_options(synchronize_session=False)
+                )
+        logger.info(f"[AsyncDatabaseManager] Updated connector {connector_id}: {list(values.keys())}")
+        return result.rowcount > 0
+
+    async def update_connector_statuses(self, statuses: Dict[str, str]) -> int:
+        if not statuses:
+            return 0
+        async with self.get_session("update_connector_statuses") as session:
+            async with session.begin():
+                result = await session.execute(DatabaseManager.connector_statuses_statement(statuses))
+        logger.info(f"[AsyncDatabaseManager] Updated status of {result.rowcount} connectors")
+        return result.rowcount
+
+    async def delete_connector(self, connector_id: str) -> bool:
+        async with self.get_session("delete_connector") as session:
+            async with session.begin():
+                connector = await session.get(ConnectorDB, connector_id)
+                if connector is None:
+                    return False
+                await session.delete(connector)
+                await session.execute(delete(ConnectorValuesDB).where(ConnectorValuesDB.name == connector.name))
+        logger.info(f"[AsyncDatabaseManager] Deleted connector: {connector.name}")
+        return True
+
+    async def get_release_history(self, name: str, limit: int = 50,
+                                  before: Optional[int] = None) -> List[ReleaseHistoryDB]:
+        statement = select(ReleaseHistoryDB).where(ReleaseHistoryDB.connector_name == name)
+        if before is not None:
+            statement = statement.where(ReleaseHistoryDB.id < before)
+        statement = statement.order_by(ReleaseHistoryDB.id.desc()).limit(limit)
+        async with self.get_session("get_release_history") as session:
+            return list((await session.execute(statement)).scalars().all())
+
+    async def get_recent_activity(self, limit: int = 50) -> List[ActivityLog]:
+        async with self.get_session("get_recent_activity") as session:
+            statement = select(ActivityLog).order_by(ActivityLog.timestamp.desc()).limit(limit)
+            return list((await session.execute(statement)).scalars().all())
+
+    async def get_activities_page(self, filters: Optional[Dict[str, str]] = None, limit: int = 50,
+                                  cursor: Optional[str] = None) -> Tuple[List[ActivityLog], Optional[str]]:
+        """
+        Newest first activity log with (timestamp, id) keyset pagination.
+
+        Returns:
+            tuple: (activities, cursor of the next page or None on the last page)
+        """
+        statement = DatabaseManager.activities_page_statement(filters, limit, cursor)
+        async with self.get_session("get_activities_page") as session:
+            activities = list((await session.execute(statement)).scalars().all())
+        if len(activities) <= limit:
+            return activities, None
+        activities = activities[:limit]
+        return activities, DatabaseManager.encode_cursor(activities[-1].timestamp, activities[-1].id)
+
+    async def get_activities_after(self, activity_id: int, filters: Optional[Dict[str, str]] = None,
+                                   limit: int = 500) -> List[ActivityLog]:
+        """
+        Activities written after activity_id, oldest first, used to resume a tail after a reconnect.
+        """
+        statement = select(ActivityLog).where(ActivityLog.id > activity_id)
+        for field, value in (filters or {}).items():
+            if value is not None:
+                statement = statement.where(getattr(ActivityLog, field) == value)
+        statement = statement.order_by(ActivityLog.id.asc()).limit(limit)
+        async with self.get_session("get_activities_after") as session:
+            return list((await session.execute(statement)).scalars().all())
+
+    async def get_activity_rollups(self, granularity: str, since: datetime, until: Optional[datetime] = None,
+                                   connector_name: Optional[str] = None) -> List[ActivityRollup]:
+        """
+        Rollup rows of the hourly or daily rollup table within [since, until), oldest bucket first.
+        """
+        model = ROLLUP_MODELS.get(granularity)
+        if model is None:
+            raise ValueError(f"Unsupported granularity: {granularity}")
+        statement = select(model).where(model.bucket >= since)
+        if until is not None:
+            statement = statement.where(model.bucket < until)
+        if connector_name is not None:
+            statement = statement.where(model.connector_name == connector_name)
+        statement = statement.order_by(model.bucket.asc())
+        async with self.get_session("get_activity_rollups") as session:
+            return list((await session.execute(statement)).scalars().all())
+
+    async def close(self):
+        await self.engine.dispose()
@@ -0,0 +1,97 @@
+import asyncio
+import json
+import logging
+from typing import Dict, Optional, Tuple
+
+from service.edcService import EdcService
+from utilities.cache import SingleFlight, TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogManager:
+    """
+        Requests the catalog of a counterparty through the management API of one of our connectors.
+        Results are cached per (connector, counterparty, query) with a ttl and LRU eviction. Expired
+        entries are still served for stale_ttl seconds while a single background request refreshes them,
+        so repeated browsing does not trigger repeated DSP catalog negotiations.
+    """
+    def __init__(self, edc_service: EdcService, catalog_endpoint: str,
+                 cache_ttl: float = 300, stale_ttl: float = 600, max_entries: int = 256):
+        self.edc_service = edc_service
+        self.catalog_endpoint = catalog_endpoint
+        self.cache = TTLCache(ttl=cache_ttl, max_entries=max_entries, stale_ttl=stale_ttl)
+        self.flight = SingleFlight()
+        self.revalidations = set()
+
+    @staticmethod
+    def cache_key(connector_url: str, counter_party_id: str, counter_party_address: str,
+                  query_spec: Optional[Dict]) -> Tuple[str, str, str, str]:
+        return connector_url, counter_party_id, counter_party_address, json.dumps(query_spec or {}, sort_keys=True)
+
+    def request_catalog(self, connector_url: str, counter_party_id: str, counter_party_address: str,
+                        query_spec: Optional[Dict]) -> Dict:
+        body = {
+            "@context": {"@vocab": "https://w3id.org/edc/v0.0.1/ns/"},
+            "@type": "CatalogRequest",
+            "counterPartyAddress": counter_party_address,
+            "counterPartyId": counter_party_id,
+            "protocol": "dataspace-protocol-http",
+            "querySpec": query_spec or {}
+        }
+        response = self.edc_service.do_post(
+            counter_party_id=counter_party_id,
+            counter_party_address=connector_url,
+            dct_type=None,
+            path=self.catalog_endpoint,
+            body=body
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def fetch(self, key: Tuple[str, str, str, str], connector_url: str, counter_party_id: str,
+                    counter_party_address: str, query_spec: Optional[Dict]) -> Dict:
+        async def load():
+            catalog = await asyncio.to_thread(
+                self.request_catalog, connector_url, counter_party_id, counter_party_address, query_spec
+            )
+            self.cache.set(key, catalog)
+            return catalog
+        return await self.flight.run(key, load)
+
+    async def revalidate(self, *args):
+        try:
+            await self.fetch(*args)
+        except Exception as e:
+            logger.error(f"[CatalogManager] Background catalog revalidation failed: {str(e)}")
+
+    async def get_catalog(self, connector_url: str, counter_party_id: str, counter_party_address: str,
+                          query_spec: Optional[Dict] = None, refresh: bool = False) -> Tuple[Dict, str]:
+        """
+        Returns:
+            tuple: (catalog, cache state) where the cache state is one of hit, stale or miss
+        """
+        key = self.cache_key(connector_url, counter_party_id, counter_party_address, query_spec)
+        args = (key, connector_url, counter_party_id, counter_party_address, query_spec)
+        if not refresh:
+            catalog, fresh = self.cache.lookup(key)
+            if catalog is not None and fresh:
+                return catalog, "hit"
+            if catalog is not None:
+                task = asyncio.ensure_future(self.revalidate(*args))
+                self.revalidations.add(task)
+                task.add_done_callback(self.revalidations.discard)
+                return catalog, "stale"
+        return await self.fetch(*args), "miss"
+
+    def invalidate(self, connector_url: Optional[str] = None, counter_party_id: Optional[str] = None) -> int:
+        return self.cache.invalidate_where(
+            lambda key: (connector_url is None or key[0] == connector_url)
+                        and (counter_party_id is None or key[1] == counter_party_id)
+        )
+
+    def get_cache_stats(self) -> Dict:
+        stats = self.cache.stats()
+        stats["inflight"] = len(self.flight.inflight)
+        stats["deduplicated"] = self.flight.deduplicated
+        return stats
@@ -1,28 +1,131 @@
-from sqlalchemy import create_engine, text, Uuid
+from sqlalchemy import Select, Update, create_engine, event, insert, select, text, Uuid, case, update, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, Session
-from models.database import Base, ConnectorDB, ActivityLog
-from typing import List, Optional
+from models.database import (Base, ConnectorDB, ConnectorValuesDB, ReleaseHistoryDB, ActivityLog,
+                             ActivityRollupHourlyDB, ActivityRollupDailyDB)
+from typing import Dict, Iterable, List, Optional, Tuple
+from datetime import datetime
+import base64
+import json
 import logging
+import os
+import time
+
+from utilities.common import values_hash
+from utilities.metrics import db_session_duration
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_DATABASE_URL = "sqlite:///edc_manager.db"
+## Activity rollup tables and how a timestamp is truncated to their bucket
+ROLLUPS = (
+    (ActivityRollupHourlyDB, lambda timestamp: timestamp.replace(minute=0, second=0, microsecond=0)),
+    (ActivityRollupDailyDB, lambda timestamp: timestamp.replace(hour=0, minute=0, second=0, microsecond=0)),
+)
+ROLLUP_KEY = ("bucket", "action", "status", "connector_name")
+## Dialects with INSERT ... ON CONFLICT DO UPDATE, the others increment row by row
+UPSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+CONNECTOR_FILTERS = ("status", "namespace", "bpn", "version")
+CONNECTOR_SORTS = ("created_at", "name")
+ACTIVITY_FILTERS = ("connector_name", "action", "status")
+
+
+class TimedSession(Session):
+    """
+        Session that reports how long it was held, from opening until close(), per DatabaseManager operation.
+    """
+    def __init__(self, *args, operation: str = "unknown", **kwargs):
+        super().__init__(*args, **kwargs)
+        self.operation = operation
+        self.opened_at = time.monotonic()
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            if self.opened_at is not None:
+                db_session_duration.labels(operation=self.operation).observe(time.monotonic() - self.opened_at)
+                self.opened_at = None
+
 
 class DatabaseManager:
-    def __init__(self, database_url: str):
-        self.database_url = database_url
-        self.engine = create_engine(database_url, echo=False)
-        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+    def __init__(self, database_url: str, database_config: Optional[Dict] = None):
+        self.database_config = database_config or {}
+        self.database_url = self.resolve_url(database_url)
+        self.engine = self.build_engine(self.database_url, self.database_config)
+        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine, class_=TimedSession)
         self.create_tables()
 
+    @staticmethod
+    def resolve_url(database_url: Optional[str]) -> str:
+        """
+        Expands environment variables in the configured url, falls back to the local sqlite file when it stays unresolved.
+        """
+        url = os.path.expandvars(database_url or "")
+        if not url or "${" in url:
+            logger.warning(f"[DatabaseManager] Database url is not set, using {DEFAULT_DATABASE_URL}")
+            return DEFAULT_DATABASE_URL
+        return url
+
+    @staticmethod
+    def engine_options(database_url: str, database_config: Dict) -> Dict:
+        """
+        SQLite connections may be used across threads and wait busy_timeout ms for a lock. Other databases get a sized,
+        pre-pinged connection pool whose connections are recycled before the server drops them.
+        """
+        echo = database_config.get("echo", False)
+        if database_url.startswith("sqlite"):
+            busy_timeout = database_config.get("sqlite", {}).get("busy_timeout", 5000)
+            return {"echo": echo, "connect_args": {"check_same_thread": False, "timeout": busy_timeout / 1000}}
+        return {
+            "echo": echo,
+            "pool_size": database_config.get("pool_size", 10),
+            "max_overflow": database_config.get("max_overflow", 20),
+            "pool_timeout": database_config.get("pool_timeout", 30),
+            "pool_recycle": database_config.get("pool_recycle", 1800),
+            "pool_pre_ping": database_config.get("pool_pre_ping", True)
+        }
+
+    @staticmethod
+    def configure_sqlite(engine: Engine, database_config: Dict):
+        """
+        Switches every new SQLite connection to WAL with synchronous=NORMAL, so readers never block the writer,
+        and sets the busy timeout so concurrent writers wait instead of failing with "database is locked".
+        """
+        sqlite_config: Dict = database_config.get("sqlite", {})
+
+        @event.listens_for(engine, "connect")
+        def configure_connection(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            try:
+                cursor.execute(f"PRAGMA journal_mode={sqlite_config.get('journal_mode', 'WAL')}")
+                cursor.execute(f"PRAGMA synchronous={sqlite_config.get('synchronous', 'NORMAL')}")
+                cursor.execute(f"PRAGMA busy_timeout={int(sqlite_config.get('busy_timeout', 5000))}")
+            finally:
+                cursor.close()
+
+    @staticmethod
+    def build_engine(database_url: str, database_config: Dict) -> Engine:
+        engine = create_engine(database_url, **DatabaseManager.engine_options(database_url, database_config))
+        if database_url.startswith("sqlite"):
+            DatabaseManager.configure_sqlite(engine, database_config)
+        return engine
+
     def create_tables(self):
         Base.metadata.create_all(bind=self.engine)
+        ## create_all skips existing tables, add indexes introduced after the table was created
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=self.engine, checkfirst=True)
         logger.info("[DatabaseManager] Database tables created successfully")
 
-    def get_session(self) -> Session:
-        return self.SessionLocal()
+    def get_session(self, operation: str = "unknown") -> Session:
+        return self.SessionLocal(operation=operation)
 
     def create_connector(self, connector: ConnectorDB) -> ConnectorDB:
-        session = self.get_session()
+        session = self.get_session("create_connector")
         try:
             session.add(connector)
             session.commit()
@@ -33,29 +136,123 @@ class DatabaseManager:
         finally:
             session.close()
 
-    def get_connector_by_id(self, connector_id: int) -> Optional[ConnectorDB]:
-        session = self.get_session()
+    def create_connectors(self, connectors: List[ConnectorDB]) -> List[ConnectorDB]:
+        """
+        Inserts all connectors in a single transaction, either all of them are created or none.
+        """
+        if not connectors:
+            return []
+        session = self.get_session("create_connectors")
+        try:
+            session.add_all(connectors)
+            session.commit()
+            for connector in connectors:
+                session.refresh(connector)
+            logger.info(f"[DatabaseManager] Created {len(connectors)} connectors")
+            return connectors
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def get_connector_by_id(self, connector_id: str) -> Optional[ConnectorDB]:
+        session = self.get_session("get_connector_by_id")
         try:
-            return session.query(Connector).filter(Connector.id == connector_id).first()
+            return session.query(ConnectorDB).filter(ConnectorDB.id == connector_id).first()
         finally:
             session.close()
 
     def get_connector_by_name(self, name: str) -> Optional[ConnectorDB]:
-        session = self.get_session()
+        session = self.get_session("get_connector_by_name")
         try:
             return session.query(ConnectorDB).filter(ConnectorDB.name == name).first()
         finally:
             session.close()
 
+    def get_connector_names(self, names: List[str]) -> List[str]:
+        session = self.get_session("get_connector_names")
+        try:
+            return [row.name for row in session.query(ConnectorDB.name).filter(ConnectorDB.name.in_(names)).all()]
+        finally:
+            session.close()
+
     def get_all_connectors(self) -> List[ConnectorDB]:
-        session = self.get_session()
+        session = self.get_session("get_all_connectors")
         try:
             return session.query(ConnectorDB).all()
         finally:
             session.close()
 
+    @staticmethod
+    def encode_cursor(sort_value, connector_id: str) -> str:
+        if isinstance(sort_value, datetime):
+            sort_value = sort_value.isoformat()
+        return base64.urlsafe_b64encode(json.dumps([sort_value, connector_id]).encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str, sort: str) -> Tuple:
+        try:
+            sort_value, connector_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if sort in ("created_at", "timestamp"):
+                sort_value = datetime.fromisoformat(sort_value)
+            return sort_value, connector_id
+        except Exception:
+            raise ValueError("Invalid cursor")
+
+    def get_connectors_page(self, filters: Optional[Dict[str, str]] = None, sort: str = "created_at",
+                            order: str = "desc", limit: Optional[int] = None,
+                            cursor: Optional[str] = None) -> Tuple[List[ConnectorDB], Optional[str]]:
+        """
+        Keyset paginated connector listing, filters and sorting are applied in SQL on (sort column, id).
+
+        Returns:
+            tuple: (connectors, cursor of the next page or None on the last page)
+        """
+        statement = self.connectors_page_statement(filters, sort, order, limit, cursor)
+        session = self.get_session("get_connectors_page")
+        try:
+            return self.paginate(session.execute(statement).scalars().all(), sort, limit)
+        finally:
+            session.close()
+
+    @staticmethod
+    def connectors_page_statement(filters: Optional[Dict[str, str]], sort: str, order: str,
+                                  limit: Optional[int], cursor: Optional[str]) -> Select:
+        if sort not in CONNECTOR_SORTS:
+            raise ValueError(f"Unsupported sort field: {sort}")
+        if order not in ("asc", "desc"):
+            raise ValueError(f"Unsupported sort order: {order}")
+
+        sort_column = getattr(ConnectorDB, sort)
+        statement = select(ConnectorDB)
+        for field, value in (filters or {}).items():
+            if field not in CONNECTOR_FILTERS:
+                raise ValueError(f"Unsupported filter: {field}")
+            if value is not None:
+                statement = statement.where(getattr(ConnectorDB, field) == value)
+
+        keyset = tuple_(sort_column, ConnectorDB.id)
+        if cursor is not None:
+            position = tuple_(*DatabaseManager.decode_cursor(cursor, sort))
+            statement = statement.where(keyset < position if order == "desc" else keyset > position)
+        if order == "desc":
+            statement = statement.order_by(sort_column.desc(), ConnectorDB.id.desc())
+        else:
+            statement = statement.order_by(sort_column.asc(), ConnectorDB.id.asc())
+        ## One row more than the page tells whether there is a next page
+        return statement if limit is None else statement.limit(limit + 1)
+
+    @staticmethod
+    def paginate(connectors: List[ConnectorDB], sort: str,
+                 limit: Optional[int]) -> Tuple[List[ConnectorDB], Optional[str]]:
+        if limit is None or len(connectors) <= limit:
+            return list(connectors), None
+        connectors = connectors[:limit]
+        return connectors, DatabaseManager.encode_cursor(getattr(connectors[-1], sort), connectors[-1].id)
+
     def update_connector(self, connector: ConnectorDB) -> Optional[ConnectorDB]:
-        session = self.get_session()
+        session = self.get_session("update_connector")
         try:
             existing = session.query(ConnectorDB).filter(ConnectorDB.id == connector.id).first()
             if existing:
@@ -68,12 +265,114 @@ class DatabaseManager:
         finally:
             session.close()
 
+    def update_connector_details(self, connector_id: str, values: Dict) -> bool:
+        session = self.get_session("update_connector_details")
+        try:
+            result = session.execute(
+                update(ConnectorDB)
+                .where(ConnectorDB.id == connector_id)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            session.commit()
+            logger.info(f"[DatabaseManager] Updated connector {connector_id}: {list(values.keys())}")
+            return result.rowcount > 0
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def update_connector_statuses(self, statuses: Dict[str, str]) -> int:
+        """
+        Writes the status of many connectors in a single UPDATE statement and transaction.
+        Rows whose stored status already matches are left untouched.
+
+        Returns:
+            int: number of connectors whose status changed
+        """
+        if not statuses:
+            return 0
+        session = self.get_session("update_connector_statuses")
+        try:
+            result = session.execute(self.connector_statuses_statement(statuses))
+            session.commit()
+            logger.info(f"[DatabaseManager] Updated status of {result.rowcount} connectors")
+            return result.rowcount
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    @staticmethod
+    def connector_statuses_statement(statuses: Dict[str, str]) -> Update:
+        new_status = case(statuses, value=ConnectorDB.id)
+        return (
+            update(ConnectorDB)
+            .where(ConnectorDB.id.in_(list(statuses.keys())))
+            .where(ConnectorDB.status.is_distinct_from(new_status))
+            .values(status=new_status)
+            .execution_options(synchronize_session=False)
+        )
+
+    def get_applied_values(self, name: str) -> Optional[ConnectorValuesDB]:
+        session = self.get_session("get_applied_values")
+        try:
+            return session.query(ConnectorValuesDB).filter(ConnectorValuesDB.name == name).first()
+        finally:
+            session.close()
+
+    def save_applied_values(self, entries: Iterable[Tuple[str, str, Dict]]):
+        """
+        Stores the rendered values applied to each (name, chart version, values) release in one transaction.
+        """
+        session = self.get_session("save_applied_values")
+        try:
+            for name, chart_version, values in entries:
+                session.merge(ConnectorValuesDB(name=name, chart_version=chart_version,
+                                                values_hash=values_hash(values), values=values))
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def add_release_history(self, entries: List[ReleaseHistoryDB]):
+        if not entries:
+            return
+        session = self.get_session("add_release_history")
+        try:
+            session.add_all(entries)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def get_release_history(self, name: str, limit: int = 50,
+                            before: Optional[int] = None) -> List[ReleaseHistoryDB]:
+        """
+        Newest first history of a connector release, before is the id of the last entry of the previous page.
+        """
+        session = self.get_session("get_release_history")
+        try:
+            query = session.query(ReleaseHistoryDB).filter(ReleaseHistoryDB.connector_name == name)
+            if before is not None:
+                query = query.filter(ReleaseHistoryDB.id < before)
+            return query.order_by(ReleaseHistoryDB.id.desc()).limit(limit).all()
+        finally:
+            session.close()
+
     def delete_connector(self, connector_id: int) -> bool:
-        session = self.get_session()
+        session = self.get_session("delete_connector")
         try:
             connector = session.query(ConnectorDB).filter(ConnectorDB.id == connector_id).first()
             if connector:
                 session.delete(connector)
+                session.query(ConnectorValuesDB).filter(ConnectorValuesDB.name == connector.name).delete()
                 session.commit()
                 logger.info(f"[DatabaseManager] Deleted connector: {connector.name}")
                 return True
@@ -85,23 +384,160 @@ class DatabaseManager:
                      connector_id: Optional[int] = None,
                      connector_name: Optional[str] = None,
                      status: Optional[str] = None):
-        session = self.get_session()
-        try:
-            log = ActivityLog(
-                connector_id=connector_id,
-                connector_name=connector_name,
-                action=action,
-                details=details,
-                status=status
+        self.add_activities([{
+            "connector_id": connector_id,
+            "connector_name": connector_name,
+            "action": action,
+            "details": details,
+            "status": status,
+            "timestamp": datetime.utcnow()
+        }])
+
+    def add_activities(self, events: List[Dict]) -> List[int]:
+        """
+        Inserts a batch of activity events as one multi-row insert and adds them to the hourly and daily
+        rollups, all in a single transaction.
+
+        Returns:
+            list: ids of the inserted rows in the order of the events
+        """
+        if not events:
+            return []
+        session = self.get_session("add_activities")
+        try:
+            activity_ids = list(session.scalars(
+                insert(ActivityLog).returning(ActivityLog.id, sort_by_parameter_order=True), events
+            ))
+            self.add_to_rollups(session, events)
+            session.commit()
+            logger.debug(f"[DatabaseManager] Logged {len(events)} activities")
+            return activity_ids
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    @staticmethod
+    def activities_page_statement(filters: Optional[Dict[str, str]], limit: int, cursor: Optional[str]) -> Select:
+        """
+        Newest first activity log on (timestamp, id), one row more than the page tells whether there is a next page.
+        """
+        statement = select(ActivityLog)
+        for field, value in (filters or {}).items():
+            if field not in ACTIVITY_FILTERS:
+                raise ValueError(f"Unsupported filter: {field}")
+            if value is not None:
+                statement = statement.where(getattr(ActivityLog, field) == value)
+        if cursor is not None:
+            position = tuple_(*DatabaseManager.decode_cursor(cursor, "timestamp"))
+            statement = statement.where(tuple_(ActivityLog.timestamp, ActivityLog.id) < position)
+        return statement.order_by(ActivityLog.timestamp.desc(), ActivityLog.id.desc()).limit(limit + 1)
+
+    @staticmethod
+    def rollup_counts(events: Iterable[Dict]) -> Dict[type, Dict[Tuple, int]]:
+        counts: Dict[type, Dict[Tuple, int]] = {model: {} for model, _ in ROLLUPS}
+        for activity in events:
+            for model, truncate in ROLLUPS:
+                key = (truncate(activity["timestamp"]), activity["action"], activity.get("status") or "",
+                       activity.get("connector_name") or "")
+                counts[model][key] = counts[model].get(key, 0) + 1
+        return counts
+
+    def add_to_rollups(self, session: Session, events: Iterable[Dict]):
+        """
+        Increments the rollup rows of the events with one upsert statement per rollup table.
+        """
+        for model, counts in self.rollup_counts(events).items():
+            if not counts:
+                continue
+            rows = [
+                {"bucket": bucket, "action": action, "status": status, "connector_name": connector_name, "count": count}
+                for (bucket, action, status, connector_name), count in counts.items()
+            ]
+            dialect = self.engine.dialect.name
+            if dialect in UPSERTS:
+                statement = UPSERTS[dialect](model)
+                session.execute(statement.on_conflict_do_update(
+                    index_elements=ROLLUP_KEY,
+                    set_={"count": model.count + statement.excluded["count"]}
+                ), rows)
+                continue
+            for row in rows:
+                existing = session.get(model, tuple(row[column] for column in ROLLUP_KEY))
+                if existing is None:
+                    session.add(model(**row))
+                else:
+                    existing.count += row["count"]
+
+    def rebuild_activity_rollups(self, chunk_size: int = 5000) -> int:
+        """
+        Fills empty rollup tables from the activity rows already stored, e.g. after the tables were introduced.
+        """
+        session = self.get_session("rebuild_activity_rollups")
+        try:
+            if session.query(ActivityRollupDailyDB).first() is not None or session.query(ActivityLog).first() is None:
+                return 0
+            columns = (ActivityLog.timestamp, ActivityLog.action, ActivityLog.status, ActivityLog.connector_name)
+            events = (
+                {"timestamp": timestamp, "action": action, "status": status, "connector_name": connector_name}
+                for timestamp, action, status, connector_name
+                in session.query(*columns).execution_options(yield_per=chunk_size)
+            )
+            counts = self.rollup_counts(events)
+            rebuilt = sum(counts[ActivityRollupDailyDB].values())
+            session.add_all(
+                model(bucket=bucket, action=action, status=status, connector_name=connector_name, count=count)
+                for model, model_counts in counts.items()
+                for (bucket, action, status, connector_name), count in model_counts.items()
             )
-            session.add(log)
             session.commit()
-            logger.debug(f"[DatabaseManager] Logged activity: {action}")
+            logger.info(f"[DatabaseManager] Rebuilt activity rollups from {rebuilt} activities")
+            return rebuilt
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def get_activities_before(self, cutoff: datetime, limit: int) -> List[ActivityLog]:
+        session = self.get_session("get_activities_before")
+        try:
+            return (session.query(ActivityLog)
+                    .filter(ActivityLog.timestamp < cutoff)
+                    .order_by(ActivityLog.timestamp.asc(), ActivityLog.id.asc())
+                    .limit(limit).all())
+        finally:
+            session.close()
+
+    def delete_activities(self, activity_ids: List[int]) -> int:
+        session = self.get_session("delete_activities")
+        try:
+            deleted = session.query(ActivityLog).filter(ActivityLog.id.in_(activity_ids)).delete(synchronize_session=False)
+            session.commit()
+            return deleted
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def delete_hourly_rollups_before(self, cutoff: datetime) -> int:
+        session = self.get_session("delete_hourly_rollups_before")
+        try:
+            deleted = (session.query(ActivityRollupHourlyDB)
+                       .filter(ActivityRollupHourlyDB.bucket < cutoff)
+                       .delete(synchronize_session=False))
+            session.commit()
+            return deleted
+        except Exception:
+            session.rollback()
+            raise
         finally:
             session.close()
 
     def get_recent_activity(self, limit: int = 50) -> List[ActivityLog]:
-        session = self.get_session()
+        session = self.get_session("get_recent_activity")
         try:
             return session.query(ActivityLog).order_by(ActivityLog.timestamp.desc()).limit(limit).all()
         finally:
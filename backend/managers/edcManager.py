@@ -1,165 +1,197 @@
-import requests
+import hashlib
+import json
 import logging
-import yaml
+import re
 import os
-from typing import Dict, Optional
+from typing import Dict, Iterator, List, Optional, Union
 from urllib.parse import urlparse
-import subprocess
 
 from models.connector import Connector
-from utilities.common import parse_yaml
+from utilities.common import render_values, write_values
+from utilities.httpClient import HttpClient
 
 logger = logging.getLogger(__name__)
 
 class EdcManager:
-    def __init__(self, cluster_config: dict, edc_config:dict, dataspace_config: dict, files_config: dict):
+    def __init__(self, cluster_config: dict, edc_config:dict, dataspace_config: dict, files_config: dict,
+                 http_client: Optional[HttpClient] = None):
         self.cluster_config = cluster_config
+        self.http_client = http_client or HttpClient()
         self.files_config = files_config
         self.default_url = edc_config.get("default_url", "")
         self.endpoints = edc_config.get("endpoints", {})
+        self.page_size = edc_config.get("page_size", 100)
+        self.urls_fingerprint = hashlib.sha1(json.dumps(self.endpoints, sort_keys=True).encode()).hexdigest()[:12]
         self.helm_chart_directory = edc_config.get("helm_chart_directory", None)
         self.ssi_wallet_url = dataspace_config.get("ssi_wallet",{}).get("url", None)
         self.authority_id = dataspace_config.get("authority_id", "BPNL00000003CRHK")
 
-    def check_health(self, connector_url: Optional[str] = None) -> Dict:
+    def build_connector_urls(self, cp_hostname: str, registry: Optional[str] = None,
+                             submodel: Optional[str] = None) -> Dict:
+        """
+        Derives the endpoint urls of a connector once, to be stored in its config.
+        The fingerprint of the endpoint configuration tells when they need to be derived again.
+        """
+        url_list = ['https://' + cp_hostname + endpoint for endpoint in self.endpoints.values()]
+        if registry:
+            url_list.append(f'https://{registry}/semantics/registry/')
+        if submodel:
+            url_list.append(f'https://{submodel}/')
+        return {"urls": url_list, "urls_fingerprint": self.urls_fingerprint}
+
+    def check_liveness(self, connector_url: Optional[str] = None) -> str:
         url = connector_url or self.default_url
         liveness_endpoint = url + self.endpoints.get("liveness", "/api/check/liveness")
-        readiness_endpoint = url + self.endpoints.get("readiness", "/api/check/readiness")
-
-        result = {
-            "url": url,
-            "liveness": "unknown",
-            "readiness": "unknown",
-            "healthy": False
-        }
         logger.info(liveness_endpoint)
         try:
-            liveness_response = requests.get(liveness_endpoint, timeout=5, verify=False)
-            result["liveness"] = "healthy" if liveness_response.status_code == 200 else "unhealthy"
+            liveness_response = self.http_client.get(liveness_endpoint, timeout=5, retries=0)
+            return "healthy" if liveness_response.status_code == 200 else "unhealthy"
         except Exception as e:
             logger.error(f"[EdcManager] Liveness check failed: {str(e)}")
-            result["liveness"] = "unhealthy"
+            return "unhealthy"
 
+    def check_readiness(self, connector_url: Optional[str] = None) -> str:
+        url = connector_url or self.default_url
+        readiness_endpoint = url + self.endpoints.get("readiness", "/api/check/readiness")
         logger.info(readiness_endpoint)
         try:
-            readiness_response = requests.get(readiness_endpoint, timeout=5, verify=False)
-            result["readiness"] = "ready" if readiness_response.status_code == 200 else "not ready"
+            readiness_response = self.http_client.get(readiness_endpoint, timeout=5, retries=0)
+            return "ready" if readiness_response.status_code == 200 else "not ready"
         except Exception as e:
             logger.error(f"[EdcManager] Readiness check failed: {str(e)}")
-            result["readiness"] = "not ready"
-        
+            return "not ready"
+
+    @staticmethod
+    def health_result(url: str, liveness: str, readiness: str) -> Dict:
+        return {
+            "url": url,
+            "liveness": liveness,
+            "readiness": readiness,
+            "healthy": liveness == "healthy" and readiness == "ready"
+        }
+
+    def check_health(self, connector_url: Optional[str] = None) -> Dict:
+        url = connector_url or self.default_url
+        result = self.health_result(url, self.check_liveness(url), self.check_readiness(url))
         logger.info(result)
-        result["healthy"] = result["liveness"] == "healthy" and result["readiness"] == "ready"
         return result
 
-    def get_assets(self, connector_url: Optional[str] = None) -> Dict:
+    @staticmethod
+    def query_spec(offset: int, limit: int) -> Dict:
+        return {
+            "@context": {"@vocab": "https://w3id.org/edc/v0.0.1/ns/"},
+            "@type": "QuerySpec",
+            "offset": offset,
+            "limit": limit
+        }
+
+    def iter_query(self, endpoint: str, connector_url: Optional[str] = None) -> Iterator[List[Dict]]:
+        """
+        Pages through a management API query endpoint with offset/limit, yielding one page at a time
+        so that large catalogs are never held in memory as a whole.
+        """
         url = connector_url or self.default_url
-        assets_endpoint = url + self.endpoints.get("assets", "/v3/assets")
-        
-        try:
-            response = requests.get(assets_endpoint, timeout=10, verify=False)
+        query_endpoint = url + endpoint + "/request"
+        offset = 0
+        while True:
+            response = self.http_client.post(query_endpoint, json=self.query_spec(offset, self.page_size))
             response.raise_for_status()
-            return response.json()
+            page = response.json()
+            if page:
+                yield page
+            if len(page) < self.page_size:
+                return
+            offset += self.page_size
+
+    def iter_assets(self, connector_url: Optional[str] = None) -> Iterator[List[Dict]]:
+        return self.iter_query(self.endpoints.get("assets", "/v3/assets"), connector_url)
+
+    def iter_policies(self, connector_url: Optional[str] = None) -> Iterator[List[Dict]]:
+        return self.iter_query(self.endpoints.get("policies", "/v3/policydefinitions"), connector_url)
+
+    def iter_contracts(self, connector_url: Optional[str] = None) -> Iterator[List[Dict]]:
+        return self.iter_query(self.endpoints.get("contracts", "/v3/contractdefinitions"), connector_url)
+
+    def get_assets(self, connector_url: Optional[str] = None) -> Union[List[Dict], Dict]:
+        try:
+            return [asset for page in self.iter_assets(connector_url) for asset in page]
         except Exception as e:
             logger.error(f"[EdcManager] Failed to get assets: {str(e)}")
             return {"error": str(e)}
 
-    def get_policies(self, connector_url: Optional[str] = None) -> Dict:
-        url = connector_url or self.default_url
-        policies_endpoint = url + self.endpoints.get("policies", "/v3/policydefinitions")
-        
+    def get_policies(self, connector_url: Optional[str] = None) -> Union[List[Dict], Dict]:
         try:
-            response = requests.get(policies_endpoint, timeout=10, verify=False)
-            response.raise_for_status()
-            return response.json()
+            return [policy for page in self.iter_policies(connector_url) for policy in page]
         except Exception as e:
             logger.error(f"[EdcManager] Failed to get policies: {str(e)}")
             return {"error": str(e)}
 
-    def get_contracts(self, connector_url: Optional[str] = None) -> Dict:
-        url = connector_url or self.default_url
-        contracts_endpoint = url + self.endpoints.get("contracts", "/v3/contractdefinitions")
-        
+    def get_contracts(self, connector_url: Optional[str] = None) -> Union[List[Dict], Dict]:
         try:
-            response = requests.get(contracts_endpoint, timeout=10, verify=False)
-            response.raise_for_status()
-            return response.json()
+            return [contract for page in self.iter_contracts(connector_url) for contract in page]
         except Exception as e:
             logger.error(f"[EdcManager] Failed to get contracts: {str(e)}")
             return {"error": str(e)}
 
-    def add_edc(self, connector: Connector, is_registry_enabled: bool, is_submodel_enabled: bool):
+    def apply_defaults(self, connector: Connector):
+        wallet_hostname =urlparse(self.ssi_wallet_url).hostname
+        connector.iatp_id = f"did:web:{wallet_hostname}:{connector.bpn}"
+        connector.trustedIssuers = f"did:web:{wallet_hostname}:{self.authority_id}"
+        connector.sts_dim_url = f"{self.ssi_wallet_url}/api/sts"
+        connector.sts_oauth_tokenUrl = f"{self.ssi_wallet_url}/oauth/token"
+        connector.sts_oauth_client_id = connector.bpn
+        connector.sts_oauth_secretAlias = "edc-wallet-secret"
+        connector.cp_bdrs_server_url = f"{self.ssi_wallet_url}/api/v1/directory"
+        connector.cp_hostname = f"{connector.name}-controlplane.arena2036-x.de"
+        connector.dp_hostname = f"{connector.name}-dataplane.arena2036-x.de"
+
+    def render_edc(self, connector: Connector, is_registry_enabled: Optional[bool] = None,
+                   is_submodel_enabled: Optional[bool] = None) -> Dict:
+        """
+        Renders the helm values of a connector without writing them, registry and submodel server
+        are enabled when their url is set unless stated otherwise.
+        """
+        if self.helm_chart_directory is None:
+            raise Exception("EDC helm chart directory was not specified")
+        self.apply_defaults(connector)
+        if is_registry_enabled is None:
+            is_registry_enabled = connector.registry is not None and len(connector.registry.url) != 0
+        if is_submodel_enabled is None:
+            is_submodel_enabled = connector.submodel is not None and len(connector.submodel.url) != 0
+        return render_values(connector=connector,
+                             helm_chart_dir=self.helm_chart_directory,
+                             files_config=self.files_config,
+                             is_registry_enabled=is_registry_enabled,
+                             is_submodel_enabled=is_submodel_enabled)
+
+    def write_edc_values(self, connector: Connector, values: Dict) -> str:
+        return write_values(values, helm_chart_dir=self.helm_chart_directory, connector=connector)
+
+    def validate_connector(self, connector: Connector) -> List[str]:
+        errors = []
+        if not re.match(r"^[a-z0-9]([-a-z0-9]*[a-z0-9])?$", connector.name) or len(connector.name) > 53:
+            errors.append("name must be a valid helm release name (lowercase alphanumerics and '-', at most 53 characters)")
         try:
-            if connector is None:
-                logger.error(f"[EDC Manager] No edc configuration was found")
-                return {"error": "[EDC Manager] No edc configuration was found"}
-            wallet_hostname =urlparse(self.ssi_wallet_url).hostname
-            connector.iatp_id = f"did:web:{wallet_hostname}:{connector.bpn}"
-            connector.trustedIssuers = f"did:web:{wallet_hostname}:{self.authority_id}"
-            connector.sts_dim_url = f"{self.ssi_wallet_url}/api/sts"
-            connector.sts_oauth_tokenUrl = f"{self.ssi_wallet_url}/oauth/token"
-            connector.sts_oauth_client_id = connector.bpn
-            connector.sts_oauth_secretAlias = "edc-wallet-secret"
-            connector.cp_bdrs_server_url = f"{self.ssi_wallet_url}/api/v1/directory"
-            connector.cp_hostname = f"{connector.name}-controlplane.arena2036-x.de"
-            connector.dp_hostname = f"{connector.name}-dataplane.arena2036-x.de"
-
-
-            values_file_name = parse_yaml(connector=connector,
-                       helm_chart_dir=self.helm_chart_directory,
-                       action="install",
-                       files_config=self.files_config,
-                       is_registry_enabled=is_registry_enabled,
-                       is_submodel_enabled=is_submodel_enabled
-                       )
-            self.copy_chart_version(connector.version)
-            return values_file_name
-        except Exception as e:
-            logger.error(f"[EDC Manager] It was not possible to do the POST request to the EDC! Reason: [{str(e)}]")
-            return {"error": str(e)}
-
-    def upgrade_edc(self, connector: Connector):
+            version_no = int(connector.version.split('.')[1])
+            if f"v{version_no}" not in self.files_config.get("charts", {}):
+                errors.append(f"unsupported connector version {connector.version}")
+        except (IndexError, ValueError):
+            errors.append(f"invalid connector version {connector.version}")
+        if connector.registry is None:
+            errors.append("registry is required, use an empty url to disable it")
+        if connector.submodel is None:
+            errors.append("submodel is required, use an empty url to disable it")
+        return errors
+
+    def get_chart_files(self) -> List[str]:
+        return [os.path.abspath(self.helm_chart_directory + chart) for chart in self.files_config.get("charts", {}).values()]
+
+    def get_chart_file(self, version) -> str:
         try:
-            if connector is None:
-                logger.error(f"[EDC Manager] No edc configuration was found")
-                return {"error": "[EDC Manager] No edc configuration was found"}
-            wallet_hostname =urlparse(self.ssi_wallet_url).hostname
-            connector.iatp_id = f"did:web:{wallet_hostname}:{connector.bpn}"
-            connector.trustedIssuers = f"did:web:{wallet_hostname}:{self.authority_id}"
-            connector.sts_dim_url = f"{self.ssi_wallet_url}/api/sts"
-            connector.sts_oauth_tokenUrl = f"{self.ssi_wallet_url}/oauth/token"
-            connector.sts_oauth_client_id = connector.bpn
-            connector.sts_oauth_secretAlias = "edc-wallet-secret"
-            connector.cp_bdrs_server_url = f"{self.ssi_wallet_url}/api/v1/directory"
-            connector.cp_hostname = f"{connector.connector_name}-controlplane.arena2036-x.de"
-            connector.dp_hostname = f"{connector.connector_name}-dataplane.arena2036-x.de"
-
-            parse_yaml(connector=connector, helm_chart_dir=self.helm_chart_directory, action="upgrade")
-
-        except Exception as e:
-            logger.error(f"[EDC Manager] It was not possible to do the PUT request to the EDC! Reason: [{str(e)}]")
-            return {"error": str(e)}
-    
-
-    def copy_chart_version(self, version):
-        logger.info("Copy charts to match version")
-        version_no = int(version.split('.')[1])
-        if version_no == 9:
-            full_path = self.helm_chart_directory + self.files_config.get("charts", {}).get("v9")
-        elif version_no == 10:
-            full_path = self.helm_chart_directory + self.files_config.get("charts", {}).get("v10")
-        elif version_no == 11:
-            full_path = self.helm_chart_directory + self.files_config.get("charts", {}).get("v11")
-
-        # Copy the version charts to Chart.yaml
-        # org_path = os.path.abspa
-
-        org_path = os.path.abspath(full_path)
-        copy_path = os.path.abspath(f"{self.helm_chart_directory}/Chart.yaml")
-        # logger.info(f"cp -rf {org_path} {copy_path}")
-        # subprocess.run(f"cp -rf {org_path} {copy_path}")
-        with open(org_path, "r") as f:
-            data = yaml.safe_load(f)
-        
-        with open(copy_path, "w") as f:
-            yaml.dump(data, f, sort_keys=False)
\ No newline at end of file
+            version_no = int(version.split('.')[1])
+        except (IndexError, ValueError):
+            raise ValueError(f"Invalid connector version {version}")
+        chart = self.files_config.get("charts", {}).get(f"v{version_no}")
+        if chart is None:
+            raise ValueError(f"Unsupported connector version {version}")
+        return os.path.abspath(self.helm_chart_directory + chart)
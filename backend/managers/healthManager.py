@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from managers.asyncDatabaseManager import AsyncDatabaseManager
+from managers.edcManager import EdcManager
+from models.database import ConnectorDB
+from utilities.cache import SingleFlight, TTLCache
+from utilities.metrics import health_probe_duration
+
+logger = logging.getLogger(__name__)
+
+
+class HealthManager:
+    """
+        Probes the liveness and readiness endpoints of many connectors concurrently.
+        The blocking probes run on a dedicated thread pool, so the number of requests
+        in flight is bounded by max_concurrency and the event loop is never blocked.
+        Results are cached per connector url for cache_ttl seconds, and concurrent
+        requests for the same url share a single in-flight probe. An optional background
+        poller refreshes all connectors on a fixed interval.
+    """
+    def __init__(self, edc_manager: EdcManager, database_manager: AsyncDatabaseManager,
+                 max_concurrency: int = 16, cache_ttl: float = 15):
+        self.edc_manager = edc_manager
+        self.database_manager = database_manager
+        self.max_concurrency = max(1, max_concurrency)
+        self.executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="health-probe")
+        self.cache = TTLCache(ttl=cache_ttl)
+        self.flight = SingleFlight()
+        self.poller: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def connector_url(connector: ConnectorDB) -> str:
+        return 'https://' + connector.cp_hostname
+
+    @property
+    def is_polling(self) -> bool:
+        return self.poller is not None and not self.poller.done()
+
+    async def check_health(self, connector_url: str) -> Dict:
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        liveness, readiness = await asyncio.gather(
+            loop.run_in_executor(self.executor, self.edc_manager.check_liveness, connector_url),
+            loop.run_in_executor(self.executor, self.edc_manager.check_readiness, connector_url)
+        )
+        result = EdcManager.health_result(connector_url, liveness, readiness)
+        health_probe_duration.labels(
+            connector=connector_url, outcome="healthy" if result["healthy"] else "unhealthy"
+        ).observe(time.monotonic() - started)
+        result["checked_at"] = time.time()
+        self.cache.set(connector_url, result)
+        logger.info(result)
+        return result
+
+    async def probe(self, connector_url: str) -> Dict:
+        return await self.flight.run(connector_url, lambda: self.check_health(connector_url))
+
+    async def get_health(self, connector_url: str) -> Dict:
+        cached = self.cache.get(connector_url)
+        if cached is not None:
+            return cached
+        return await self.probe(connector_url)
+
+    async def check_all(self, connector_urls: List[str], use_cache: bool = True) -> Dict[str, Dict]:
+        unique_urls = list(dict.fromkeys(connector_urls))
+        lookup = self.get_health if use_cache else self.probe
+        results = await asyncio.gather(*[lookup(url) for url in unique_urls])
+        return dict(zip(unique_urls, results))
+
+    def get_cache_stats(self) -> Dict:
+        stats = self.cache.stats()
+        stats["inflight"] = len(self.flight.inflight)
+        stats["deduplicated"] = self.flight.deduplicated
+        return stats
+
+    @staticmethod
+    def get_age(result: Dict) -> float:
+        return round(time.time() - result.get("checked_at", 0), 3)
+
+    async def refresh_connectors(self):
+        connectors: List[ConnectorDB] = await self.database_manager.get_all_connectors()
+        results = await self.check_all([self.connector_url(connector) for connector in connectors], use_cache=False)
+        changed_statuses: Dict[str, str] = {}
+        for connector in connectors:
+            status = "healthy" if results[self.connector_url(connector)]["healthy"] else "unhealthy"
+            if connector.status != status:
+                changed_statuses[connector.id] = status
+        await self.database_manager.update_connector_statuses(changed_statuses)
+        logger.debug(f"[HealthManager] Refreshed health of {len(connectors)} connectors")
+
+    async def poll(self, refresh_interval: float):
+        while True:
+            started = time.monotonic()
+            try:
+                await self.refresh_connectors()
+            except Exception as e:
+                logger.error(f"[HealthManager] Background health refresh failed: {str(e)}")
+            await asyncio.sleep(max(0.0, refresh_interval - (time.monotonic() - started)))
+
+    def start_polling(self, refresh_interval: float):
+        if self.is_polling:
+            return
+        logger.info(f"[HealthManager] Refreshing connector health every {refresh_interval}s")
+        self.poller = asyncio.create_task(self.poll(refresh_interval))
+
+    async def stop_polling(self):
+        if self.poller is None:
+            return
+        self.poller.cancel()
+        try:
+            await self.poller
+        except asyncio.CancelledError:
+            pass
+        self.poller = None
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,68 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from managers.edcManager import EdcManager
+from models.database import ConnectorDB
+
+logger = logging.getLogger(__name__)
+
+RESOURCES = ("assets", "policies", "contracts")
+
+
+class InventoryManager:
+    """
+        Collects the assets, policies and contract definitions of all managed connectors at once.
+        Every (connector, resource) query runs concurrently on a bounded thread pool, so the whole
+        inventory costs about one slowest-connector latency instead of the sum of all of them.
+    """
+    def __init__(self, edc_manager: EdcManager, max_concurrency: int = 16):
+        self.edc_manager = edc_manager
+        self.max_concurrency = max(1, max_concurrency)
+        self.executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="inventory")
+
+    def get_loader(self, resource: str):
+        return {
+            "assets": self.edc_manager.get_assets,
+            "policies": self.edc_manager.get_policies,
+            "contracts": self.edc_manager.get_contracts
+        }[resource]
+
+    async def get_inventory(self, connectors: List[ConnectorDB]) -> Dict:
+        loop = asyncio.get_running_loop()
+        queries = [
+            (connector, resource, loop.run_in_executor(
+                self.executor, self.get_loader(resource), 'https://' + connector.cp_hostname
+            ))
+            for connector in connectors for resource in RESOURCES
+        ]
+        results = await asyncio.gather(*[query for _, _, query in queries], return_exceptions=True)
+
+        inventory: Dict = {resource: [] for resource in RESOURCES}
+        summaries: Dict[str, Dict] = {
+            connector.name: {"name": connector.name, "bpn": connector.bpn, "counts": {}, "errors": {}}
+            for connector in connectors
+        }
+        for (connector, resource, _), result in zip(queries, results):
+            summary = summaries[connector.name]
+            if isinstance(result, Exception) or isinstance(result, dict):
+                error = str(result) if isinstance(result, Exception) else result.get("error", "unknown error")
+                logger.error(f"[InventoryManager] Failed to get {resource} of {connector.name}: {error}")
+                summary["errors"][resource] = error
+                continue
+            summary["counts"][resource] = len(result)
+            inventory[resource].extend({"connector": connector.name, "data": item} for item in result)
+
+        for summary in summaries.values():
+            if not summary["errors"]:
+                summary["status"] = "complete"
+            elif len(summary["errors"]) == len(RESOURCES):
+                summary["status"] = "failed"
+            else:
+                summary["status"] = "partial"
+        inventory["connectors"] = list(summaries.values())
+        return inventory
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,110 @@
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from utilities.metrics import deploy_job_duration, deploy_jobs, deploy_jobs_in_flight
+from utilities.operators import op
+
+logger = logging.getLogger(__name__)
+
+FINISHED_PHASES = ("succeeded", "failed")
+
+
+class JobManager:
+    """
+        Runs long lived deployment operations (helm install/upgrade) as jobs on a bounded worker pool,
+        so request handlers can return a job id right away instead of blocking until helm finishes.
+        Finished jobs are kept in memory up to max_history entries.
+    """
+    def __init__(self, max_workers: int = 4, max_history: int = 200):
+        self.max_workers = max(1, max_workers)
+        self.max_history = max_history
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="deploy-job")
+        self.jobs: "OrderedDict[str, Dict]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get_active_job(self, target: str) -> Optional[Dict]:
+        with self.lock:
+            for job in self.jobs.values():
+                if target in job["targets"] and job["phase"] not in FINISHED_PHASES:
+                    return dict(job)
+            return None
+
+    def submit(self, job_type: str, target: str, function: Callable,
+               targets: Optional[List[str]] = None, **kwargs) -> Dict:
+        """
+        Queues function(progress=..., **kwargs), progress(phase) lets the job report intermediate phases.
+        Whatever the function returns is stored as the job result, a "output" key is reported separately.
+        targets lists every connector the job works on when it is more than the single target.
+        """
+        job_id = str(uuid.uuid4())
+        job = {
+            "id": job_id,
+            "type": job_type,
+            "target": target,
+            "targets": targets or [target],
+            "phase": "queued",
+            "submitted_at": op.timestamp(),
+            "started_at": None,
+            "finished_at": None,
+            "duration": None,
+            "output": None,
+            "result": None,
+            "error": None
+        }
+        with self.lock:
+            self.jobs[job_id] = job
+            self.prune()
+        deploy_jobs_in_flight.labels(type=job_type, state="queued").inc()
+        self.executor.submit(self.run, job_id, function, kwargs)
+        logger.info(f"[JobManager] Queued {job_type} job {job_id} for {target}")
+        return dict(job)
+
+    def run(self, job_id: str, function: Callable, kwargs: Dict):
+        job_type = self.jobs[job_id]["type"]
+        deploy_jobs_in_flight.labels(type=job_type, state="queued").dec()
+        deploy_jobs_in_flight.labels(type=job_type, state="running").inc()
+        self.update(job_id, phase="running", started_at=op.timestamp())
+        started = time.monotonic()
+        outcome = "failed"
+        try:
+            result = function(progress=lambda phase: self.update(job_id, phase=phase), **kwargs)
+            output = result.pop("output", None) if isinstance(result, dict) else None
+            self.update(job_id, phase="succeeded", result=result, output=output)
+            outcome = "succeeded"
+        except Exception as e:
+            logger.exception(f"[JobManager] Job {job_id} failed: {str(e)}")
+            self.update(job_id, phase="failed", error=str(e))
+        finally:
+            duration = time.monotonic() - started
+            self.update(job_id, finished_at=op.timestamp(), duration=round(duration, 3))
+            deploy_jobs_in_flight.labels(type=job_type, state="running").dec()
+            deploy_jobs.labels(type=job_type, outcome=outcome).inc()
+            deploy_job_duration.labels(type=job_type, outcome=outcome).observe(duration)
+
+    def update(self, job_id: str, **fields):
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is not None:
+                job.update(fields)
+
+    def prune(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job["phase"] in FINISHED_PHASES]
+        for job_id in finished[:max(0, len(self.jobs) - self.max_history)]:
+            del self.jobs[job_id]
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def get_jobs(self) -> List[Dict]:
+        with self.lock:
+            return [dict(job) for job in reversed(self.jobs.values())]
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Uuid, Column, String, Integer, DateTime, Text, Boolean, JSON
+from sqlalchemy import Uuid, Column, String, Integer, Float, DateTime, Text, Boolean, JSON, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from sqlalchemy import ForeignKey
@@ -43,6 +43,14 @@ class ConnectorDB(Base):
         all frontend connector related information must be fetched from this class
     """
     __tablename__ = "connectors"
+    ## Composite indexes backing the filtered, keyset paginated connector listing
+    __table_args__ = (
+        Index("ix_connectors_created_at_id", "created_at", "id"),
+        Index("ix_connectors_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_connectors_namespace_created_at_id", "namespace", "created_at", "id"),
+        Index("ix_connectors_bpn_created_at_id", "bpn", "created_at", "id"),
+        Index("ix_connectors_version_created_at_id", "version", "created_at", "id"),
+    )
 
     id = Column(String(50), primary_key=True, index=True)
     name = Column(String(255), unique=True, nullable=False, index=True)
@@ -88,12 +96,78 @@ class ConnectorDB(Base):
         }
 
 
+class ConnectorValuesDB(Base):
+    """
+        Last rendered helm values applied to a connector release, upgrades are diffed against them
+    """
+    __tablename__ = "connector_values"
+
+    name = Column(String(255), primary_key=True)
+    chart_version = Column(String(50), nullable=True)
+    values_hash = Column(String(64), nullable=False)
+    values = Column(JSON, nullable=False)
+    applied_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "chart_version": self.chart_version,
+            "values_hash": self.values_hash,
+            "applied_at": self.applied_at.isoformat() if self.applied_at else None
+        }
+
+
+class ReleaseHistoryDB(Base):
+    """
+        One entry per helm install/upgrade of a connector release, successful or not
+    """
+    __tablename__ = "release_history"
+    ## Backs the newest first history of a single connector
+    __table_args__ = (
+        Index("ix_release_history_connector_name_id", "connector_name", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    connector_name = Column(String(255), nullable=False)
+    action = Column(String(50), nullable=False)
+    revision = Column(Integer, nullable=True)
+    chart_version = Column(String(50), nullable=True)
+    app_version = Column(String(50), nullable=True)
+    status = Column(String(50), nullable=True)
+    outcome = Column(String(50), nullable=False)
+    duration = Column(Float, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "connector_name": self.connector_name,
+            "action": self.action,
+            "revision": self.revision,
+            "chart_version": self.chart_version,
+            "app_version": self.app_version,
+            "status": self.status,
+            "outcome": self.outcome,
+            "duration": self.duration,
+            "error": self.error,
+            "created_at": self.created_at.isoformat() if self.created_at else None
+        }
+
+
 class ActivityLog(Base):
     """
         Activity log to keep track of user activity
         Monitor tab in EMC frontend can use information in this table
     """
     __tablename__ = "activity_logs"
+    ## Keyset pagination of the activity log on (timestamp, id), alone and per filter
+    __table_args__ = (
+        Index("ix_activity_logs_timestamp_id", "timestamp", "id"),
+        Index("ix_activity_logs_connector_name_timestamp_id", "connector_name", "timestamp", "id"),
+        Index("ix_activity_logs_action_timestamp_id", "action", "timestamp", "id"),
+        Index("ix_activity_logs_status_timestamp_id", "status", "timestamp", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     connector_id = Column(Uuid, nullable=True)
@@ -106,10 +180,39 @@ class ActivityLog(Base):
     def to_dict(self):
         return {
             "id": self.id,
-            "connector_id": self.connector_id,
+            "connector_id": str(self.connector_id) if self.connector_id else None,
             "connector_name": self.connector_name,
             "action": self.action,
             "details": self.details,
             "status": self.status,
             "timestamp": self.timestamp.isoformat() if self.timestamp else None,
         }
+
+
+class ActivityRollup:
+    """
+        Number of activity events per time bucket, action, status and connector.
+        Missing status or connector are stored as an empty string so they can be part of the primary key.
+    """
+    bucket = Column(DateTime, primary_key=True)
+    action = Column(String(100), primary_key=True)
+    status = Column(String(50), primary_key=True, default="")
+    connector_name = Column(String(255), primary_key=True, default="")
+    count = Column(Integer, nullable=False, default=0)
+
+    def to_dict(self):
+        return {
+            "bucket": self.bucket.isoformat() if self.bucket else None,
+            "action": self.action,
+            "status": self.status or None,
+            "connector_name": self.connector_name or None,
+            "count": self.count
+        }
+
+
+class ActivityRollupHourlyDB(ActivityRollup, Base):
+    __tablename__ = "activity_rollups_hourly"
+
+
+class ActivityRollupDailyDB(ActivityRollup, Base):
+    __tablename__ = "activity_rollups_daily"
@@ -45,6 +45,13 @@ class EdcPostRequest(EdcRequest):
     content_type: Optional[str] = "application/json"
 
 
+class CatalogRequest(BaseModel):
+    counter_party_id: str
+    counter_party_address: str
+    query_spec: Optional[Dict] = None
+    refresh: Optional[bool] = False
+
+
 class Search(BaseModel):
     bpn: str
 
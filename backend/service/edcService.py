@@ -1,25 +1,45 @@
-import requests
+import hashlib
 import logging
 import os
 import json
+import re
+import shutil
 import subprocess
+import tempfile
+import threading
+import time
 import yaml
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 from utilities import httpUtils
 from utilities.common import delete_file
+from utilities.httpClient import HttpClient
+from utilities.locks import ReleaseLockManager
+from utilities.metrics import helm_command_duration
 
 logger = logging.getLogger(__name__)
 
 SUB_DIR = "charts/umbrella"
 DEFAULT_VALUES_FILE = "values.yaml"
+## Files of the chart directory that never belong into a packaged chart
+BUILD_IGNORE = ("Chart*.yaml", "Chart.lock", "values_*.yaml", "*_values_*.yaml", "charts")
 
 
 class EdcService:
-    def __init__(self, helm_chart_directory="./tractusx-connector"):
+    def __init__(self, helm_chart_directory="./tractusx-connector", http_client: Optional[HttpClient] = None,
+                 dependency_cache_directory="./data/helm-dependencies", chart_cache_directory="./data/helm-charts",
+                 release_index_ttl: float = 30):
        self.helm_directory = helm_chart_directory
+       self.release_index_ttl = release_index_ttl
+       self.release_index: Dict[str, Tuple[float, Dict[str, Dict]]] = {}
+       self.release_index_lock = threading.Lock()
+       self.dependency_cache_directory = dependency_cache_directory
+       self.chart_cache_directory = chart_cache_directory
+       self.charts: Dict[str, str] = {}
+       self.chart_locks = ReleaseLockManager()
+       self.http_client = http_client or HttpClient()
+       self.release_locks = ReleaseLockManager()
        self.ensure_kubectl_installed()
        self.ensure_helm_installed()
-       self.update_helm_dependencies()
 
     def ensure_kubectl_installed(self):
         try:
@@ -48,57 +68,225 @@ class EdcService:
             # subprocess.run("helm version --client")
             print("kubectl installed successfully.")
 
-    def update_helm_dependencies(self):
-        os.chdir(f"{self.helm_directory}")
-        print(f"Working directory: {os.getcwd()}")
-        subprocess.run("helm dependency update", shell=True)
-        os.chdir("..")
+    def run_helm(self, args: List[str], cwd: Optional[str] = None) -> subprocess.CompletedProcess:
+        """
+        Runs helm with an explicit argument list and working directory, never through the shell
+        and never by changing the working directory of the whole process.
+        """
+        started = time.monotonic()
+        result = subprocess.run(["helm", *args], cwd=cwd or self.helm_directory, capture_output=True, text=True)
+        helm_command_duration.labels(
+            command=args[0], outcome="succeeded" if result.returncode == 0 else "failed"
+        ).observe(time.monotonic() - started)
+        return result
 
-    def install_helm_chart(self, deployment_name:str, values_files:list, namespace:str):
+    def update_helm_dependencies(self, chart_directory: Optional[str] = None):
+        chart_directory = chart_directory or self.helm_directory
+        print(f"Updating helm dependencies in: {os.path.abspath(chart_directory)}")
+        result = self.run_helm(["dependency", "update"], cwd=chart_directory)
+        if (result.returncode !=0):
+            logger.error(f"[EdcService] helm dependency update failed: {result.stderr}")
+            return False
+        return True
+
+    @staticmethod
+    def dependency_key(chart_directory: str) -> str:
+        """
+        Hash of the dependencies declared in Chart.yaml (name, alias, version, repository, condition).
+        The subchart archives resolved for a key are cached and restored instead of downloading them again.
+        """
+        with open(os.path.join(chart_directory, "Chart.yaml"), "r") as f:
+            dependencies = (yaml.safe_load(f) or {}).get("dependencies", [])
+        return hashlib.sha256(json.dumps(dependencies, sort_keys=True).encode()).hexdigest()
+
+    @staticmethod
+    def list_archives(directory: str) -> List[str]:
+        if not os.path.isdir(directory):
+            return []
+        return sorted(file for file in os.listdir(directory) if file.endswith(".tgz"))
+
+    @staticmethod
+    def is_dependency_cache_complete(cache_directory: str) -> bool:
+        """
+        A cached dependency set is only restored when its Chart.lock is there and every locked
+        dependency has its archive next to it.
+        """
+        lock_file = os.path.join(cache_directory, "Chart.lock")
+        if not os.path.exists(lock_file):
+            return False
+        with open(lock_file, "r") as f:
+            dependencies = (yaml.safe_load(f) or {}).get("dependencies", []) or []
+        archives = set(EdcService.list_archives(cache_directory))
+        return all(f"{dependency['name']}-{dependency['version']}.tgz" in archives for dependency in dependencies)
+
+    def ensure_helm_dependencies(self, chart_directory: str) -> bool:
+        """
+        Fills the charts/ directory of a chart, from the dependency cache when the same dependencies
+        were resolved before and with helm dependency update otherwise.
+        """
+        charts_directory = os.path.join(chart_directory, "charts")
+        key = self.dependency_key(chart_directory)
+        cache_directory = os.path.join(self.dependency_cache_directory, key)
+
+        if self.is_dependency_cache_complete(cache_directory):
+            logger.info(f"[EdcService] Restoring helm dependencies from cache [{key[:12]}]")
+            os.makedirs(charts_directory, exist_ok=True)
+            for archive in self.list_archives(cache_directory):
+                shutil.copy2(os.path.join(cache_directory, archive), charts_directory)
+            shutil.copy2(os.path.join(cache_directory, "Chart.lock"), chart_directory)
+            return True
+        ## Left behind by an interrupted run of an older version, resolved again below
+        shutil.rmtree(cache_directory, ignore_errors=True)
+
+        if not self.update_helm_dependencies(chart_directory):
+            return False
+        if not os.path.exists(os.path.join(chart_directory, "Chart.lock")):
+            return True
+        ## Filled in a directory of its own and published at once, a half copied cache is never restored
+        os.makedirs(self.dependency_cache_directory, exist_ok=True)
+        build_directory = tempfile.mkdtemp(prefix=f".build-{key[:16]}-", dir=self.dependency_cache_directory)
+        try:
+            for archive in self.list_archives(charts_directory):
+                shutil.copy2(os.path.join(charts_directory, archive), build_directory)
+            shutil.copy2(os.path.join(chart_directory, "Chart.lock"), build_directory)
+            os.replace(build_directory, cache_directory)
+        except OSError as e:
+            ## Another run published the same key first
+            logger.debug(f"[EdcService] Helm dependency cache [{key[:12]}] not published: {str(e)}")
+        finally:
+            shutil.rmtree(build_directory, ignore_errors=True)
+        return True
+
+    def chart_key(self, chart_file: str) -> str:
+        """
+        Hash of everything that ends up in the packaged chart: the version Chart file, values.yaml and the templates.
+        """
+        digest = hashlib.sha256()
+        files = [os.path.abspath(chart_file), os.path.join(self.helm_directory, DEFAULT_VALUES_FILE)]
+        for root, directories, names in os.walk(os.path.join(self.helm_directory, "templates")):
+            directories.sort()
+            files.extend(os.path.join(root, name) for name in sorted(names))
+        for file in files:
+            digest.update(os.path.relpath(file, self.helm_directory).encode())
+            with open(file, "rb") as f:
+                digest.update(f.read())
+        return digest.hexdigest()
+
+    def materialize_chart(self, chart_file: str) -> Optional[str]:
+        """
+        Packages the chart directory with chart_file as its Chart.yaml into an immutable .tgz,
+        stored under chart_cache_directory/<chart key>/ so it survives restarts and is only rebuilt when the chart changes.
+
+        Returns:
+            str: absolute path of the packaged chart, None when packaging failed
+        """
+        key = self.chart_key(chart_file)
+        package_directory = os.path.abspath(os.path.join(self.chart_cache_directory, key[:16]))
+        packages = self.list_archives(package_directory)
+        if packages:
+            return os.path.join(package_directory, packages[0])
+
+        logger.info(f"[EdcService] Packaging {chart_file} [{key[:12]}]")
+        build_directory = os.path.abspath(os.path.join(self.chart_cache_directory, f".build-{key[:16]}"))
+        chart_directory = os.path.join(build_directory, os.path.basename(os.path.abspath(self.helm_directory)))
+        shutil.rmtree(build_directory, ignore_errors=True)
+        try:
+            shutil.copytree(self.helm_directory, chart_directory, ignore=shutil.ignore_patterns(*BUILD_IGNORE))
+            shutil.copy2(chart_file, os.path.join(chart_directory, "Chart.yaml"))
+            if not self.ensure_helm_dependencies(chart_directory):
+                return None
+            os.makedirs(build_directory + "-package", exist_ok=True)
+            result = self.run_helm(["package", chart_directory, "--destination", build_directory + "-package"])
+            if (result.returncode !=0):
+                logger.error(f"[EdcService] helm package failed: {result.stderr}")
+                return None
+            ## Publishing the whole directory at once, a half written package is never picked up
+            os.makedirs(self.chart_cache_directory, exist_ok=True)
+            os.replace(build_directory + "-package", package_directory)
+        finally:
+            shutil.rmtree(build_directory, ignore_errors=True)
+            shutil.rmtree(build_directory + "-package", ignore_errors=True)
+        return os.path.join(package_directory, self.list_archives(package_directory)[0])
+
+    def get_chart(self, chart_file: str) -> str:
+        """
+        Returns the packaged chart for chart_file, packaging it on first use. Concurrent callers for the same
+        chart wait for a single packaging run, different charts are packaged in parallel.
+        """
+        chart_file = os.path.abspath(chart_file)
+        package = self.charts.get(chart_file)
+        if package is not None and os.path.exists(package):
+            return package
+        with self.chart_locks.acquire(chart_file):
+            package = self.charts.get(chart_file)
+            if package is None or not os.path.exists(package):
+                package = self.materialize_chart(chart_file)
+                if package is None:
+                    raise Exception(f"It was not possible to package the helm chart {chart_file}")
+                self.charts[chart_file] = package
+        return package
+
+    def prepare_charts(self, chart_files: List[str]):
+        for chart_file in chart_files:
+            try:
+                logger.info(f"[EdcService] Chart {chart_file} is ready at {self.get_chart(chart_file)}")
+            except Exception as e:
+                logger.error(f"[EdcService] Preparing chart {chart_file} failed: {str(e)}")
+
+    @staticmethod
+    def values_arguments(values_files: list) -> List[str]:
+        return [argument for file in values_files for argument in ("-f", file)]
+
+    def install_helm_chart(self, deployment_name:str, values_files:list, namespace:str, chart:str="."):
         try:
-            self.update_helm_dependencies()
-            os.chdir(f"{self.helm_directory}")
-            formatted_files = " ".join([" -f " + file for file in values_files])
             print(f"Installing helm chart with values from {values_files}...")
-            result = subprocess.run(f"helm install {deployment_name} \
-            {formatted_files} --namespace {namespace} --set log4j2.config=\"default log4j2 config placeholder\" --create-namespace --debug .", shell=True, capture_output=True, text=True)
+            started = time.monotonic()
+            with self.release_locks.acquire(deployment_name):
+                result = self.run_helm(["install", deployment_name, *self.values_arguments(values_files),
+                                        "--namespace", namespace,
+                                        "--set", "log4j2.config=default log4j2 config placeholder",
+                                        "--create-namespace", "--debug", chart, "-o", "json"])
+                self.invalidate_release_index(namespace)
+            duration = round(time.monotonic() - started, 3)
             if (result.returncode !=0):
                 logger.error(f"[EdcService] It was not possible to install EDC, return code: {str(result.returncode)}")
-                return {"status_code": 500, "data": result.stderr}
-            logger.info(f"stdout: {result.stdout}")
+                return {"status_code": 500, "data": result.stderr, "duration": duration}
             logger.debug(f"stderr: {result.stderr}")
 
             # delete a file(s) after the installation
-            # [ delete_file(f"{os.getcwd()}/{file}") for file in values_files ]
-            os.chdir("..")
-            return {"status_code": 200, "data": result.stdout}
+            # [ delete_file(os.path.join(self.helm_directory, file)) for file in values_files ]
+            release = self.parse_helm_result(result.stdout)
+            logger.info(f"[EdcService] Installed {release['name']} revision {release['revision']} [{release['status']}] in {duration}s")
+            return {"status_code": 200, "data": release, "duration": duration}
 
         except subprocess.CalledProcessError as err:
             logger.error(f"[EdcService] error occurred in install EDC: {str(err.stderr)}")
-            os.chdir("..")
             return {"status_code": 500, "data": err}
         except Exception as e:
             logger.error(f"[EdcService] Install EDC failed: {str(e)}")
-            os.chdir("..")
             return {"status_code": 500, "data": e}
 
 
-    def upgrade_helm_chart(self, deployment_name:str, values_files:list, namespace:str):
+    def upgrade_helm_chart(self, deployment_name:str, values_files:list, namespace:str, chart:str="."):
 
         try:
-            formatted_files = " ".join([" -f " + file for file in values_files])
             print(f"Upgrading helm chart with values from {values_files}...")
-            result = subprocess.run(f"helm upgrade -i {deployment_name}  {formatted_files} --namespace {namespace} --debug .", shell=True, capture_output=True, text=True)
+            started = time.monotonic()
+            with self.release_locks.acquire(deployment_name):
+                result = self.run_helm(["upgrade", "-i", deployment_name, *self.values_arguments(values_files),
+                                        "--namespace", namespace, "--debug", chart, "-o", "json"])
+                self.invalidate_release_index(namespace)
+            duration = round(time.monotonic() - started, 3)
             if (result.returncode !=0):
                 logger.error(f"[EdcService] It was not possible to upgrade EDC, return code: {str(result.returncode)}")
-                return {"status_code": 500, "data": result.stderr}
-            logger.info(f"stdout: {result.stdout}")
-            logger.debug(f"stderr: {result.stdout}")
-            logger.info(f"Upgrade EDC successful...")
+                return {"status_code": 500, "data": result.stderr, "duration": duration}
+            logger.debug(f"stderr: {result.stderr}")
 
             # delete a file(s) after the installation
-            [ delete_file(f"{os.getcwd()}/{file}") for file in values_files ]
-            return {"status_code": 200, "data": result.stdout}
+            [ delete_file(os.path.join(self.helm_directory, file)) for file in values_files ]
+            release = self.parse_helm_result(result.stdout)
+            logger.info(f"[EdcService] Upgraded {release['name']} to revision {release['revision']} [{release['status']}] in {duration}s")
+            return {"status_code": 200, "data": release, "duration": duration}
 
         except subprocess.CalledProcessError as err:
             logger.error(f"[EdcService] Internal Server error occurred in upgrade EDC: {str(err.stderr)}")
@@ -107,15 +295,71 @@ class EdcService:
             logger.error(f"[EdcService] Internal Server error, Upgrade EDC failed: {str(e)}")
             return {"status_code": 500, "data": e}
 
+    @staticmethod
+    def parse_helm_result(output: str) -> Dict:
+        """
+        Summary of the release object helm install/upgrade print with -o json, the rendered manifest is dropped.
+        """
+        release = json.loads(output)
+        info = release.get("info", {})
+        metadata = release.get("chart", {}).get("metadata", {})
+        return {
+            "name": release.get("name"),
+            "namespace": release.get("namespace"),
+            "revision": release.get("version"),
+            "status": info.get("status"),
+            "description": info.get("description"),
+            "last_deployed": info.get("last_deployed"),
+            "chart": metadata.get("name"),
+            "chart_version": metadata.get("version"),
+            "app_version": metadata.get("appVersion")
+        }
+
+    @staticmethod
+    def parse_release(release: Dict) -> Dict:
+        chart = release.get("chart", "")
+        match = re.match(r"^(.*)-(v?\d+\.\d+\.\d+.*)$", chart)
+        return {
+            "name": release.get("name"),
+            "namespace": release.get("namespace"),
+            "revision": int(release.get("revision", 0)),
+            "status": release.get("status"),
+            "chart": match.group(1) if match else chart,
+            "chart_version": match.group(2) if match else None,
+            "app_version": release.get("app_version"),
+            "updated": release.get("updated")
+        }
+
+    def refresh_release_index(self, namespace: str) -> Dict[str, Dict]:
+        """
+        Rebuilds the release index of a namespace from helm list -o json.
+        """
+        result = self.run_helm(["list", "--namespace", namespace, "--all", "--max", "0", "-o", "json"])
+        if (result.returncode !=0):
+            raise Exception(result.stderr)
+        releases = {
+            release["name"]: release
+            for release in (self.parse_release(entry) for entry in json.loads(result.stdout or "[]"))
+        }
+        with self.release_index_lock:
+            self.release_index[namespace] = (time.monotonic(), releases)
+        logger.debug(f"[EdcService] Indexed {len(releases)} helm releases in {namespace}")
+        return releases
+
+    def get_releases(self, namespace: str) -> Dict[str, Dict]:
+        with self.release_index_lock:
+            entry = self.release_index.get(namespace)
+        if entry is None or time.monotonic() - entry[0] > self.release_index_ttl:
+            return self.refresh_release_index(namespace)
+        return entry[1]
+
+    def invalidate_release_index(self, namespace: str):
+        with self.release_index_lock:
+            self.release_index.pop(namespace, None)
+
     def get_all_connectors(self, namespace:str):
         try:
-            result = subprocess.run(f"helm list --namespace {namespace}", shell=True, capture_output=True, text=True)
-            if (result.returncode !=0):
-                logger.error(f"[EdcService] It was not possible to get all EDCs, return code: {str(result.returncode)}")
-                raise
-            logger.info(f"stdout: {result.stdout}")
-            logger.debug(f"stderr: {result.stdout}")
-            return {"status_code": 200, "data": result.stdout}
+            return {"status_code": 200, "data": list(self.get_releases(namespace).values())}
 
         except Exception as e:
             logger.error(f"[EdcService] Internal Server error, list EDCs failed: {str(e)}")
@@ -123,14 +367,10 @@ class EdcService:
 
     def get_connector_by_name(self, namespace, connector_name):
         try:
-            ## TODO: get connector_name by Id
-            result = subprocess.run(f"helm list --namespace {namespace} | grep -i {connector_name}", shell=True, capture_output=True, text=True)
-            if (result.returncode !=0):
-                logger.error(f"[EdcService] It was not possible to get the EDC, return code: {str(result.returncode)}")
-                raise
-            logger.info(f"stdout: {result.stdout}")
-            logger.debug(f"stderr: {result.stdout}")
-            return {"status_code": 200, "data": result.stdout}
+            release = self.get_releases(namespace).get(connector_name)
+            if release is None:
+                return {"status_code": 404, "data": f"No release named {connector_name} in {namespace}"}
+            return {"status_code": 200, "data": release}
 
         except Exception as e:
             logger.error(f"[EdcService] Internal Server error, get the EDC failed: {str(e)}")
@@ -140,13 +380,16 @@ class EdcService:
         try:
             ## TODO: get connector_name by Id
             connector_name = connector_id
-            result = subprocess.run(f"helm uninstall {connector_name} --namespace {namespace}", shell=True, capture_output=True, text=True)
+            started = time.monotonic()
+            with self.release_locks.acquire(connector_name):
+                result = self.run_helm(["uninstall", connector_name, "--namespace", namespace])
+                self.invalidate_release_index(namespace)
+            duration = round(time.monotonic() - started, 3)
             if (result.returncode !=0):
                 logger.error(f"[EdcService] It was not possible to delete the EDC, return code: {str(result.returncode)}")
-                return {"status_code": 500, "data": result.stderr}
-            logger.info(f"stdout: {result.stdout}")
-            logger.debug(f"stderr: {result.stdout}")
-            return {"status_code": 200, "data": result.stdout}
+                return {"status_code": 500, "data": result.stderr, "duration": duration}
+            logger.debug(f"stderr: {result.stderr}")
+            return {"status_code": 200, "data": result.stdout, "duration": duration}
 
         except Exception as e:
             logger.error(f"[EdcService] Internal Server error, delete the EDC failed: {str(e)}")
@@ -155,7 +398,7 @@ class EdcService:
     def check_connection(self) -> bool:
         try:
             liveness_url = self.default_url + self.endpoints.get("liveness", "/api/check/liveness")
-            response = requests.get(liveness_url, timeout=5, verify=False)
+            response = self.http_client.get(liveness_url, timeout=5, retries=0)
             return response.status_code == 200
         except Exception as e:
             logger.error(f"[EdcService] Connection check failed: {str(e)}")
@@ -168,7 +411,7 @@ class EdcService:
         logger.info(f"[EdcService] Performing GET request to {counter_party_address}{path}")
         try:
             url = f"{counter_party_address}{path}"
-            response = requests.get(url, headers=headers or {}, timeout=30, verify=False)
+            response = self.http_client.get(url, headers=headers or {})
             return response
         except Exception as e:
             logger.error(f"[EdcService] GET request failed: {str(e)}")
@@ -186,7 +429,7 @@ class EdcService:
             if headers is None:
                 headers = {}
             headers["Content-Type"] = content_type
-            response = requests.post(url, json=body, headers=headers, timeout=30, verify=False)
+            response = self.http_client.post(url, json=body, headers=headers)
             return response
         except Exception as e:
             logger.error(f"[EdcService] POST request failed: {str(e)}")
@@ -0,0 +1,112 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+        Thread safe in-memory cache whose entries expire ttl seconds after they were stored.
+        Expired entries stay readable through lookup() for another stale_ttl seconds, so callers
+        can serve them while revalidating. When max_entries is set, the least recently used
+        entry is evicted first. Hits and misses are counted so the ttl can be tuned against the real load.
+    """
+    def __init__(self, ttl: float, max_entries: Optional[int] = None, stale_ttl: float = 0):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def lookup(self, key: Hashable) -> Tuple[Optional[Any], bool]:
+        """
+        Returns:
+            tuple: (value, fresh), value is None when the key is missing or past its stale window
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, False
+            age = time.monotonic() - entry[0]
+            if age > self.ttl + self.stale_ttl:
+                del self.entries[key]
+                self.misses += 1
+                return None, False
+            self.entries.move_to_end(key)
+            if age > self.ttl:
+                self.stale_hits += 1
+                return entry[1], False
+            self.hits += 1
+            return entry[1], True
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        value, fresh = self.lookup(key)
+        return value if fresh else None
+
+    def get_age(self, key: Hashable) -> Optional[float]:
+        with self.lock:
+            entry = self.entries.get(key)
+            return None if entry is None else time.monotonic() - entry[0]
+
+    def set(self, key: Hashable, value: Any):
+        with self.lock:
+            self.entries[key] = (time.monotonic(), value)
+            self.entries.move_to_end(key)
+            while self.max_entries is not None and len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        with self.lock:
+            if key is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        with self.lock:
+            keys = [key for key in self.entries if predicate(key)]
+            for key in keys:
+                del self.entries[key]
+            return len(keys)
+
+    def stats(self) -> Dict:
+        with self.lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "ttl": self.ttl,
+                "stale_ttl": self.stale_ttl,
+                "max_entries": self.max_entries,
+                "size": len(self.entries),
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round((self.hits + self.stale_hits) / lookups, 4) if lookups else None
+            }
+
+
+class SingleFlight:
+    """
+        Runs at most one coroutine per key at a time, concurrent callers for the same key
+        await the call already in flight instead of starting their own.
+    """
+    def __init__(self):
+        self.inflight: Dict[Hashable, asyncio.Future] = {}
+        self.deduplicated = 0
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        task = self.inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self.inflight[key] = task
+            task.add_done_callback(lambda _: self.inflight.pop(key, None))
+        else:
+            self.deduplicated += 1
+        return await asyncio.shield(task)
@@ -1,6 +1,11 @@
 import base64
+import copy
+import hashlib
+import json
 import subprocess
 import os
+import re
+import threading
 import urllib.parse
 import requests
 import yaml
@@ -13,6 +18,20 @@ logger = logging.getLogger(__name__)
 SUB_DIR = "charts/umbrella"
 DEFAULT_VALUES_FILE = "values.yaml"
 
+## Use the LibYAML bindings when PyYAML was built with them
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+SafeDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+## Top level sections of the values template that parse_yaml writes into, everything else is shared
+OVERRIDDEN_SECTIONS = ("participant", "iatp", "controlplane", "dataplane", "postgresql",
+                       "simple-data-backend", "digital-twin-registry")
+
+## Values whose content must not show up in a diff
+SECRET_KEYS = re.compile(r"password|credentials", re.IGNORECASE)
+
+values_templates: dict = {}
+values_templates_lock = threading.Lock()
+
 def ensure_kubectl_installed():
     try:
         subprocess.run("kubectl version --client", capture_output=True)
@@ -61,6 +80,33 @@ def upgrade_helm_chart(deployment_name:str, values_files:list, namespace:str):
     subprocess.run(f"helm upgrade -i {deployment_name} {formatted_files} --namespace {namespace} --debug .")
     print(f"Upgrade helm chart successful...")
 
+def load_values_template(path: str) -> dict:
+    """
+    Parses the base values file of a chart version once and keeps it until the file changes on disk.
+    The returned template is shared and must not be modified, use copy_values_template.
+    """
+    path = os.path.abspath(path)
+    modified = os.stat(path).st_mtime_ns
+    with values_templates_lock:
+        cached = values_templates.get(path)
+    if cached is not None and cached[0] == modified:
+        return cached[1]
+    with open(path, "r") as file:
+        data = yaml.load(file, Loader=SafeLoader)
+    with values_templates_lock:
+        values_templates[path] = (modified, data)
+    return data
+
+def copy_values_template(template: dict) -> dict:
+    """
+    Copy of the template in which only the sections parse_yaml overrides are deep copied.
+    """
+    data = dict(template)
+    for section in OVERRIDDEN_SECTIONS:
+        if section in data:
+            data[section] = copy.deepcopy(data[section])
+    return data
+
 def parse_yaml(connector: Connector,
                helm_chart_dir:str,
                action="install",
@@ -71,7 +117,25 @@ def parse_yaml(connector: Connector,
     # try:
     if helm_chart_dir is None:
         return {"error": "EDC helm chart directory was not specified [ADD EDC]"}
-    print(connector.version)
+    data = render_values(connector=connector,
+                         helm_chart_dir=helm_chart_dir,
+                         files_config=files_config,
+                         is_registry_enabled=is_registry_enabled,
+                         is_submodel_enabled=is_submodel_enabled)
+    return write_values(data, helm_chart_dir=helm_chart_dir, connector=connector)
+    # except Exception as e:
+    #     logging.error(f"It was not possible to do the POST request to the EDC! Reason: [{str(e)}]")
+    #     return {"error": str(e)}
+
+def render_values(connector: Connector,
+                  helm_chart_dir: str,
+                  files_config: dict = {},
+                  is_registry_enabled: bool = False,
+                  is_submodel_enabled: bool = False
+                  ) -> dict:
+    """
+    Renders the values of a connector on top of the base values of its chart version, without writing them.
+    """
     version_no = int(connector.version.split('.')[1])
     if version_no == 9:
         full_path = helm_chart_dir + files_config.get("values", {}).get("v9")
@@ -80,9 +144,8 @@ def parse_yaml(connector: Connector,
     elif version_no == 11:
         full_path = helm_chart_dir + files_config.get("values", {}).get("v11")
 
-    # Step 1: Open and parse the existing YAML file
-    with open(os.path.abspath(full_path), "r") as file:
-        data = yaml.safe_load(file)
+    # Step 1: Take a copy of the parsed base values of the chart version
+    data = copy_values_template(load_values_template(full_path))
 
     if is_submodel_enabled:
         data.setdefault("simple-data-backend", {})["enabled"] = True
@@ -131,16 +194,60 @@ def parse_yaml(connector: Connector,
     data.setdefault("postgresql", {}).setdefault("auth", {})["username"] = connector.db_username
     data.setdefault("postgresql", {}).setdefault("auth", {})["password"] = connector.db_password
 
+    return data
+
+def write_values(data: dict, helm_chart_dir: str, connector: Connector) -> str:
+    version_no = int(connector.version.split('.')[1])
     # Save updated YAML
     file_path = f"{helm_chart_dir}/{connector.name}_values_{version_no}.yaml"
     # full_path = os.path.abspath(file_path)
     with open(file_path, "w") as file:
-        yaml.dump(data, file, sort_keys=False)
+        yaml.dump(data, file, Dumper=SafeDumper, sort_keys=False)
 
     return f"{connector.name}_values_{version_no}.yaml"
-    # except Exception as e:
-    #     logging.error(f"It was not possible to do the POST request to the EDC! Reason: [{str(e)}]")
-    #     return {"error": str(e)}
+
+def values_hash(data: dict) -> str:
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+
+def diff_values(old, new, path: str = "") -> list:
+    """
+    Structural diff of two rendered values trees, one entry per changed leaf:
+    {"path": "controlplane.ingresses[0].hostname", "change": "added|removed|changed", "old": ..., "new": ...}
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        changes = []
+        for key in list(old) + [key for key in new if key not in old]:
+            key_path = f"{path}.{key}" if path else str(key)
+            if key not in new:
+                changes.append({"path": key_path, "change": "removed", "old": old[key], "new": None})
+            elif key not in old:
+                changes.append({"path": key_path, "change": "added", "old": None, "new": new[key]})
+            else:
+                changes.extend(diff_values(old[key], new[key], key_path))
+        return changes
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        return [change for index, (old_item, new_item) in enumerate(zip(old, new))
+                for change in diff_values(old_item, new_item, f"{path}[{index}]")]
+    if old != new:
+        return [{"path": path, "change": "changed", "old": old, "new": new}]
+    return []
+
+def mask_secrets(value):
+    if isinstance(value, dict):
+        return {key: "***" if SECRET_KEYS.search(str(key)) else mask_secrets(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [mask_secrets(item) for item in value]
+    return value
+
+def mask_diff(changes: list) -> list:
+    """
+    Hides the old and new values of secrets (passwords, credentials) in a diff before it leaves the backend.
+    """
+    return [
+        {**change, "old": "***", "new": "***"} if SECRET_KEYS.search(change["path"].rsplit(".", 1)[-1])
+        else {**change, "old": mask_secrets(change["old"]), "new": mask_secrets(change["new"])}
+        for change in changes
+    ]
 
 
 def delete_file(file_path):
@@ -0,0 +1,77 @@
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+
+class HttpClient:
+    """
+        Keeps one connection pooled requests session per connector host (scheme://host:port),
+        so repeated management API calls reuse their keep-alive connections instead of
+        opening a new TCP+TLS connection every time.
+    """
+    def __init__(self, pool_size: int = 10, keep_alive: bool = True,
+                 connect_timeout: float = 5, read_timeout: float = 30,
+                 retries: int = 2, backoff_factor: float = 0.3, verify: bool = False):
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.timeout = (connect_timeout, read_timeout)
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.verify = verify
+        self.sessions: Dict[Tuple[str, int], requests.Session] = {}
+        self.lock = threading.Lock()
+
+    def get_session(self, url: str, retries: Optional[int] = None) -> requests.Session:
+        parsed = urlparse(url)
+        retries = self.retries if retries is None else retries
+        key = (f"{parsed.scheme}://{parsed.netloc}", retries)
+        session = self.sessions.get(key)
+        if session is not None:
+            return session
+        with self.lock:
+            session = self.sessions.get(key)
+            if session is None:
+                session = self.create_session(retries)
+                self.sessions[key] = session
+                logger.debug(f"[HttpClient] Created connection pool for {key[0]}")
+            return session
+
+    def create_session(self, retries: int) -> requests.Session:
+        retry = Retry(
+            total=retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({"GET", "HEAD", "OPTIONS"}),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=retry)
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.verify = self.verify
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+        return session
+
+    def request(self, method: str, url: str, retries: Optional[int] = None, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        return self.get_session(url, retries=retries).request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        with self.lock:
+            for session in self.sessions.values():
+                session.close()
+            self.sessions.clear()
@@ -1,16 +1,20 @@
 from fastapi.responses import JSONResponse, StreamingResponse
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, Iterator, Optional
 import io
+import json
 
 
 class HttpUtils:
     @staticmethod
-    def response(data: Any = None, status: int = 200, message: Optional[str] = None):
+    def response(data: Any = None, status: int = 200, message: Optional[str] = None,
+                 pagination: Optional[Dict] = None):
         response_data = {}
         if message:
             response_data["message"] = message
         if data is not None:
             response_data["data"] = data
+        if pagination is not None:
+            response_data["pagination"] = pagination
         return JSONResponse(content=response_data, status_code=status)
 
     @staticmethod
@@ -41,3 +45,34 @@ class HttpUtils:
             media_type=content_type,
             headers={"Content-Disposition": f'attachment; filename="{filename}"'}
         )
+
+    @staticmethod
+    def json_stream_response(items: Iterable[Any], status: int = 200):
+        def encode() -> Iterator[bytes]:
+            separator = b"["
+            for item in items:
+                yield separator + json.dumps(item).encode("utf-8")
+                separator = b","
+            yield b"[]" if separator == b"[" else b"]"
+
+        return StreamingResponse(encode(), media_type="application/json", status_code=status)
+
+    @staticmethod
+    def event_stream_response(events: AsyncIterable[Optional[Dict]], retry: int = 3000):
+        """
+        Server-Sent Events stream, every dict is sent as an event with its "id" as event id and
+        None as a comment that keeps idle connections and proxies open.
+        """
+        async def encode() -> AsyncIterator[bytes]:
+            yield f"retry: {retry}\n\n".encode("utf-8")
+            async for event in events:
+                if event is None:
+                    yield b": keep-alive\n\n"
+                else:
+                    yield f"id: {event['id']}\ndata: {json.dumps(event, default=str)}\n\n".encode("utf-8")
+
+        return StreamingResponse(
+            encode(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
@@ -0,0 +1,30 @@
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+
+class ReleaseLockManager:
+    """
+        One lock per helm release, operations on the same release run strictly one after the other
+        while operations on different releases run in parallel. Unused locks are dropped again.
+    """
+    def __init__(self):
+        self.locks: Dict[str, threading.Lock] = {}
+        self.holders: Dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def acquire(self, release: str) -> Iterator[None]:
+        with self.lock:
+            release_lock = self.locks.setdefault(release, threading.Lock())
+            self.holders[release] = self.holders.get(release, 0) + 1
+        try:
+            with release_lock:
+                yield
+        finally:
+            with self.lock:
+                self.holders[release] -= 1
+                if self.holders[release] == 0:
+                    del self.holders[release]
+                    del self.locks[release]
+
@@ -0,0 +1,63 @@
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+## Helm runs take seconds to minutes, everything else is expected well below a second
+HELM_BUCKETS = (0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+PROBE_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+## Media type of the text exposition format served by /metrics
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+helm_command_duration = Histogram(
+    "emc_helm_command_duration_seconds",
+    "Duration of helm subprocess runs",
+    ["command", "outcome"],
+    buckets=HELM_BUCKETS
+)
+
+health_probe_duration = Histogram(
+    "emc_health_probe_duration_seconds",
+    "Duration of a liveness and readiness check of a connector",
+    ["connector", "outcome"],
+    buckets=PROBE_BUCKETS
+)
+
+db_session_duration = Histogram(
+    "emc_db_session_duration_seconds",
+    "Time a database session is held, from opening until it is closed",
+    ["operation"],
+    buckets=PROBE_BUCKETS
+)
+
+http_request_duration = Histogram(
+    "emc_http_request_duration_seconds",
+    "Latency of the API per route",
+    ["method", "route", "status"],
+    buckets=PROBE_BUCKETS
+)
+
+http_requests_in_flight = Gauge(
+    "emc_http_requests_in_flight",
+    "API requests currently being handled"
+)
+
+deploy_jobs_in_flight = Gauge(
+    "emc_deploy_jobs_in_flight",
+    "Deployment jobs that are queued or running",
+    ["type", "state"]
+)
+
+deploy_jobs = Counter(
+    "emc_deploy_jobs",
+    "Finished deployment jobs",
+    ["type", "outcome"]
+)
+
+deploy_job_duration = Histogram(
+    "emc_deploy_job_duration_seconds",
+    "Duration of deployment jobs from start to finish",
+    ["type", "outcome"],
+    buckets=HELM_BUCKETS
+)
+
+
+def render_metrics() -> bytes:
+    return generate_latest()
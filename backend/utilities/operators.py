@@ -1,5 +1,6 @@
 import os
-from datetime import datetime
+from datetime import datetime, timezone
+from typing import Optional
 
 
 class Operators:
@@ -20,5 +21,16 @@ class Operators:
     def timestamp() -> str:
         return datetime.now().isoformat()
 
+    @staticmethod
+    def from_epoch(seconds: float) -> str:
+        return datetime.fromtimestamp(seconds).isoformat()
+
+    @staticmethod
+    def to_utc(value: Optional[datetime]) -> Optional[datetime]:
+        ## Stored timestamps are naive UTC, aware query parameters are converted to match them
+        if value is None or value.tzinfo is None:
+            return value
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+
 
 op = Operators()